@@ -0,0 +1,296 @@
+import heapq
+import sys
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from constants import *
+from game_objects import Snake, Apple
+from snake_env import SnakeEnv
+
+Cell = Tuple[int, int]
+Direction = Tuple[int, int]
+Path = List[Tuple[Direction, Cell]]
+
+# Соседи каждой клетки поля с переходом через края: клетка -> ((направление, сосед), ...)
+_NEIGHBORS: Dict[Cell, Tuple[Tuple[Direction, Cell], ...]] = {
+    (x * GRID_SIZE, y * GRID_SIZE): tuple(
+        (direction, (((x + direction[0]) % GRID_WIDTH) * GRID_SIZE,
+                     ((y + direction[1]) % GRID_HEIGHT) * GRID_SIZE))
+        for direction in SnakeEnv.ACTIONS)
+    for y in range(GRID_HEIGHT) for x in range(GRID_WIDTH)
+}
+
+# Как часто поиск сверяется с бюджетом времени (в раскрытых клетках)
+_CHECK_EVERY = 8
+# Оценка времени подготовки поиска на одну клетку тела, нс
+_NS_PER_CELL = 100
+# Запас бюджета на запасной ход после прерывания поиска, нс
+_FALLBACK_NS = 20_000
+# Крайний срок автопилота без бюджета: недостижим, выбор хода не зависит от времени
+_NO_DEADLINE = sys.maxsize
+
+
+class _BudgetExceeded(Exception):
+    """Поиск не уложился в бюджет времени тика."""
+
+
+def _require(deadline: int, cells: int = 0):
+    """
+    Прерывает выбор хода, если до крайнего срока не успеть обработать cells клеток.
+
+    Args:
+        deadline: Крайний момент времени perf_counter_ns.
+        cells: Размер предстоящей работы за O(n) (например, длина тела).
+    """
+    if time.perf_counter_ns() + cells * _NS_PER_CELL > deadline:
+        raise _BudgetExceeded
+
+
+def _distance(a: Cell, b: Cell) -> int:
+    """Расстояние в клетках на поле с переходом через края."""
+    dx = abs(a[0] - b[0]) // GRID_SIZE
+    dy = abs(a[1] - b[1]) // GRID_SIZE
+    return min(dx, GRID_WIDTH - dx) + min(dy, GRID_HEIGHT - dy)
+
+
+def _release_times(body: Sequence[Cell], grow: int) -> Dict[Cell, int]:
+    """
+    Для каждой клетки тела - номер хода, начиная с которого в нее можно войти.
+
+    Столкновение проверяется до освобождения хвоста, поэтому клетка
+    i-го сегмента (0 - голова) освобождается для входа на ходу
+    len(body) - i + 1 плюс число ходов, на которые змейка еще вырастет.
+
+    Args:
+        body: Клетки тела от головы к хвосту.
+        grow: На сколько сегментов змейка еще вырастет.
+    """
+    n = len(body)
+    return {cell: n - i + 1 + grow for i, cell in enumerate(body)}
+
+
+class Autopilot:
+    """
+    Автопилот змейки: поиск пути A* к яблоку с проверкой безопасности.
+
+    Тело змейки учитывается во времени: клетка хвоста считается свободной
+    с того хода, когда хвост ее покинет. Найденный путь к яблоку принимается,
+    только если после его прохождения голова может дойти до своего хвоста,
+    иначе змейка следует за хвостом. Путь кешируется: пока змейка идет по
+    нему и яблоко не переставлено, ход выбирается за O(1). Если змейка
+    свернула с пути, путь восстанавливается коротким поиском до ближайшей
+    его клетки. Бюджет времени проверяется перед каждым поиском и
+    подготовкой за O(n) и внутри поиска; если его не хватает, выбирается
+    быстрый жадный ход в свободную клетку (на него оставлен запас бюджета).
+    Без бюджета ходы зависят только от состояния игры (нужно для
+    воспроизводимых турниров).
+    """
+
+    def __init__(self, budget_us: Optional[int] = 2000, safe: bool = True):
+        """
+        Инициализация автопилота.
+
+        Args:
+            budget_us: Бюджет времени на выбор хода в микросекундах (None - без ограничения).
+            safe: Проверять, что после пути к яблоку голова может дойти до хвоста.
+        """
+        self.budget_us = budget_us
+        self.safe = safe
+        # Статистика: полные поиски, восстановления пути, превышения бюджета
+        self.replans = 0
+        self.repairs = 0
+        self.timeouts = 0
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает кешированный путь (например, при новой игре)."""
+        self._path: Deque[Tuple[Direction, Cell]] = deque()
+        self._fallback: Deque[Tuple[Direction, Cell]] = deque()
+        self._target: Optional[Cell] = None
+        self._expected: Optional[Cell] = None
+
+    def __call__(self, env: SnakeEnv) -> Optional[Direction]:
+        """Возвращает действие для SnakeEnv.step."""
+        return self.choose(env.snake, env.apple)
+
+    def steer(self, snake: Snake, apple: Apple):
+        """Записывает выбранное направление в snake.next_direction."""
+        direction = self.choose(snake, apple)
+        if direction is not None:
+            snake.next_direction = direction
+
+    def choose(self, snake: Snake, apple: Apple) -> Optional[Direction]:
+        """
+        Выбирает направление на следующий тик.
+
+        Args:
+            snake: Змейка.
+            apple: Яблоко.
+
+        Returns:
+            Направление или None, если безопасного хода нет.
+        """
+        if self.budget_us is None:
+            deadline = _NO_DEADLINE
+        else:
+            deadline = time.perf_counter_ns() + self.budget_us * 1000 - _FALLBACK_NS
+        following = snake.positions[0] == self._expected
+        cached = self._target == apple.position and self._path
+        # Змейка сделала ожидаемый шаг: остаток пути проверен при построении
+        if cached and following:
+            return self._take()
+        try:
+            if cached and self._repair(snake, deadline):
+                self.repairs += 1
+                return self._take()
+            return self._plan(snake, apple.position, deadline)
+        except _BudgetExceeded:
+            self.timeouts += 1
+            # Продолжаем проверенный путь (после яблока он ведет к хвосту)
+            if following and (self._path or self._fallback):
+                return self._take()
+            self.reset()
+            return self._greedy(snake)
+
+    def _take(self) -> Direction:
+        """Снимает очередной шаг с пути к яблоку, а после него - с пути к хвосту."""
+        direction, self._expected = (self._path or self._fallback).popleft()
+        return direction
+
+    def _plan(self, snake: Snake, apple: Cell, deadline: int) -> Optional[Direction]:
+        """Строит новый путь к яблоку, при опасности - к хвосту."""
+        self.replans += 1
+        body = snake.positions
+        _require(deadline, len(body))
+        grow = snake.length - len(body)
+        release = _release_times(body, grow)
+        path = self._search(body[0], snake.direction, release, {apple: 0}, apple, deadline)
+        if path:
+            fallback = self._tail_path(snake, path, deadline) if self.safe else []
+            if fallback is not None:
+                self._path, self._fallback = deque(path), deque(fallback)
+                self._target = apple
+                return self._take()
+        # Пути к яблоку нет или он ведет в ловушку: идем за хвостом,
+        # а к яблоку пробуем снова на следующем тике
+        tail = body[-1]
+        if len(body) > 1:
+            path = self._search(body[0], snake.direction, release, {tail: 0}, tail, deadline)
+            if path:
+                self._path, self._fallback = deque(), deque(path)
+                self._target = None
+                return self._take()
+        self.reset()
+        return self._greedy(snake)
+
+    def _repair(self, snake: Snake, deadline: int) -> bool:
+        """
+        Соединяет голову с ближайшей клеткой кешированного пути.
+
+        Returns:
+            True, если путь восстановлен и остается допустимым.
+        """
+        body = snake.positions
+        _require(deadline, len(body) + len(self._path))
+        release = _release_times(body, snake.length - len(body))
+        goals = {cell: i for i, (_, cell) in enumerate(self._path)}
+        detour = self._search(body[0], snake.direction, release, goals, None, deadline)
+        if not detour:
+            return False
+        _require(deadline, len(self._path))
+        path = detour + list(self._path)[goals[detour[-1][1]] + 1:]
+        seen = set()
+        for t, (_, cell) in enumerate(path, 1):
+            if release.get(cell, 0) > t or cell in seen:
+                return False
+            seen.add(cell)
+        fallback = self._tail_path(snake, path, deadline) if self.safe else []
+        if fallback is None:
+            return False
+        self._path, self._fallback = deque(path), deque(fallback)
+        return True
+
+    def _tail_path(self, snake: Snake, path: Path, deadline: int) -> Optional[Path]:
+        """
+        Проверка безопасности пути к яблоку.
+
+        Returns:
+            Путь от яблока до хвоста после прохождения пути и роста
+            (пустой, если проверка не нужна) или None, если хвост недостижим.
+        """
+        length = len(snake.positions)
+        _require(deadline, length + len(path))
+        cells = [cell for _, cell in reversed(path)]
+        size = min(length + len(path), snake.length)
+        body = (cells + list(snake.positions))[:size]
+        if size <= 2 or size + 1 >= GRID_WIDTH * GRID_HEIGHT:
+            return []
+        release = _release_times(body, snake.length + 1 - size)
+        tail = body[-1]
+        return self._search(body[0], path[-1][0], release, {tail: 0}, tail, deadline)
+
+    def _search(self, start: Cell, direction: Direction, release: Dict[Cell, int],
+                goals: Dict[Cell, int], target: Optional[Cell], deadline: int) -> Optional[Path]:
+        """
+        Поиск A* кратчайшего пути с учетом освобождения клеток тела.
+
+        Args:
+            start: Клетка головы.
+            direction: Текущее направление (разворот на первом шаге запрещен).
+            release: Номер хода, с которого можно войти в клетку тела.
+            goals: Целевые клетки.
+            target: Единственная цель для эвристики или None (поиск в ширину).
+            deadline: Крайний момент времени perf_counter_ns.
+
+        Returns:
+            Путь [(направление, клетка), ...] без начальной клетки или None.
+        """
+        _require(deadline)
+        reverse = (direction[0] * -1, direction[1] * -1)
+        parents: Dict[Cell, Tuple[Direction, Cell]] = {}
+        best = {start: 0}
+        heap = [(0, 0, start)]
+        expanded = 0
+        while heap:
+            _, t, cell = heapq.heappop(heap)
+            if t > best[cell]:
+                continue
+            expanded += 1
+            if expanded % _CHECK_EVERY == 0 and time.perf_counter_ns() > deadline:
+                raise _BudgetExceeded
+            t += 1
+            for step, neighbor in _NEIGHBORS[cell]:
+                if t == 1 and step == reverse:
+                    continue
+                if release.get(neighbor, 0) > t or best.get(neighbor, t + 1) <= t:
+                    continue
+                best[neighbor] = t
+                parents[neighbor] = (step, cell)
+                if neighbor in goals:
+                    path = []
+                    while neighbor != start:
+                        step, previous = parents[neighbor]
+                        path.append((step, neighbor))
+                        neighbor = previous
+                    path.reverse()
+                    return path
+                estimate = t + (_distance(neighbor, target) if target is not None else 0)
+                heapq.heappush(heap, (estimate, t, neighbor))
+        return None
+
+    def _greedy(self, snake: Snake) -> Optional[Direction]:
+        """Быстрый ход в свободную клетку с наибольшим числом свободных соседей."""
+        head = snake.positions[0]
+        occupied = snake.occupied
+        tail = snake.positions[-1] if snake.length == len(snake.positions) else None
+        reverse = (snake.direction[0] * -1, snake.direction[1] * -1)
+        best, best_free = None, -1
+        for direction, cell in _NEIGHBORS[head]:
+            if direction == reverse or cell in occupied:
+                continue
+            free = sum(1 for _, neighbor in _NEIGHBORS[cell]
+                       if neighbor not in occupied or neighbor == tail)
+            if free > best_free:
+                best, best_free = direction, free
+        return best
@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import random
+from typing import Dict, Optional
+
+from multiplayer import BoardMirror, MultiplayerGame, frame_length
+from server import GameServer
+
+
+class BotStats:
+    """Счетчики, общие для всех ботов."""
+
+    def __init__(self):
+        """Инициализация нулевых счетчиков."""
+        self.frames = 0
+        self.bytes_received = 0
+        self.turns_sent = 0
+
+
+async def run_bot(host: str, port: int, stats: BotStats, stop: asyncio.Event,
+                  turn_probability: float = 0.1, mirror: Optional[BoardMirror] = None,
+                  rng: Optional[random.Random] = None):
+    """
+    Бот без отрисовки: читает кадры сервера и случайно поворачивает.
+
+    Args:
+        host: Адрес сервера.
+        port: Порт сервера.
+        stats: Общие счетчики ботов.
+        stop: Событие остановки.
+        turn_probability: Вероятность поворота после кадра.
+        mirror: Копия поля, если бот должен применять изменения.
+        rng: Генератор случайных чисел.
+    """
+    rng = rng or random.Random()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while not stop.is_set():
+            header = await reader.readexactly(4)
+            payload = await reader.readexactly(frame_length(header))
+            stats.frames += 1
+            stats.bytes_received += 4 + len(payload)
+            if mirror is not None:
+                mirror.apply(payload)
+            if rng.random() < turn_probability:
+                writer.write(bytes((rng.randrange(4),)))
+                stats.turns_sent += 1
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run_load(players: int = 200, duration: float = 10.0, tick_rate: float = 50.0,
+                   width: int = 64, height: int = 48, apples: int = 20,
+                   turn_probability: float = 0.1, seed: Optional[int] = None) -> Dict[str, float]:
+    """
+    Запускает сервер в текущем процессе и нагружает его ботами.
+
+    Один бот ведет копию поля, по окончании она сверяется с полем сервера.
+
+    Returns:
+        Метрики сервера, трафик на клиента и результат сверки копии поля.
+    """
+    rng = random.Random(seed)
+    server = GameServer(MultiplayerGame(width, height, apples, seed), tick_rate)
+    await server.start('127.0.0.1', 0)
+    stats = BotStats()
+    stop = asyncio.Event()
+    mirror = BoardMirror()
+    bots = [asyncio.create_task(run_bot('127.0.0.1', server.port, stats, stop, turn_probability,
+                                        mirror if i == 0 else None, random.Random(rng.random())))
+            for i in range(players)]
+    try:
+        await asyncio.sleep(duration)
+        metrics = server.metrics()
+        # Сверка после остановки тиков, когда бот-наблюдатель получит последний кадр
+        await server.stop_ticks()
+        for _ in range(100):
+            if mirror.tick == server.game.tick_count:
+                break
+            await asyncio.sleep(0.01)
+        mirror_ok = mirror.matches(server.game)
+    finally:
+        stop.set()
+        await server.stop()
+        # Боты, чье подключение сервер так и не принял, ждали бы данных вечно
+        _, pending = await asyncio.wait(bots, timeout=1.0)
+        for bot in pending:
+            bot.cancel()
+        await asyncio.gather(*bots, return_exceptions=True)
+
+    metrics.update({
+        'bot_frames': stats.frames,
+        'bot_bytes_per_tick': stats.bytes_received / max(stats.frames, 1),
+        'turns_sent': stats.turns_sent,
+        'mirror_ok': mirror_ok,
+    })
+    return metrics
+
+
+def print_metrics(metrics: Dict[str, float], tick_rate: float):
+    """Выводит результаты нагрузки."""
+    print(f"Тиков: {metrics['ticks']} ({metrics['ticks_per_second']:.1f}/с при цели {tick_rate:g}), "
+          f"время тика p50 {metrics['tick_ms_p50']:.2f} мс, p99 {metrics['tick_ms_p99']:.2f} мс")
+    print(f"Игроков: {metrics['players']}, отключено медленных: {metrics['dropped']}")
+    print(f"Трафик: {metrics['bytes_per_second'] / 1e6:.2f} МБ/с всего, "
+          f"{metrics['bot_bytes_per_tick']:.0f} байт на клиента за тик")
+    print(f"Копия поля у клиента совпадает с сервером: {'да' if metrics['mirror_ok'] else 'нет'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Нагрузка на сервер змейки ботами')
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=10.0, help='секунд')
+    parser.add_argument('--tick-rate', type=float, default=50.0, help='тиков в секунду')
+    parser.add_argument('--width', type=int, default=64, help='ширина поля в клетках')
+    parser.add_argument('--height', type=int, default=48, help='высота поля в клетках')
+    parser.add_argument('--apples', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    result = asyncio.run(run_load(args.players, args.duration, args.tick_rate, args.width,
+                                  args.height, args.apples, seed=args.seed))
+    print_metrics(result, args.tick_rate)
@@ -1,5 +1,4 @@
-# Константы игры
-import pygame
+# Константы игры (без зависимости от pygame)
 
 # Размеры экрана
 SCREEN_WIDTH = 640
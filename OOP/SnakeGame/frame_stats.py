@@ -0,0 +1,81 @@
+import csv
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+# Фазы кадра в порядке выполнения
+PHASES = ('input', 'update', 'draw', 'flip')
+PERCENTILES = (50, 95, 99)
+
+
+class FrameStats:
+    """
+    Измерение времени фаз кадра со скользящими перцентилями.
+
+    Кадр начинается вызовом start_frame(), конец каждой фазы отмечается
+    вызовом mark(фаза), кадр завершается end_frame(). Время хранится
+    в миллисекундах для последних window кадров и, при необходимости,
+    записывается построчно в CSV.
+    """
+
+    def __init__(self, window: int = 300, csv_path: Optional[str] = None):
+        """
+        Инициализация статистики.
+
+        Args:
+            window: Количество последних кадров для перцентилей.
+            csv_path: Файл CSV для записи времени каждого кадра (None - без записи).
+        """
+        self.window = {phase: deque(maxlen=window) for phase in PHASES + ('frame',)}
+        self.frames = 0
+        self._current: Dict[str, float] = {}
+        self._frame_start = self._last = 0.0
+        self._file = None
+        self._writer = None
+        if csv_path is not None:
+            self._file = open(csv_path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(('frame', 'ticks') + tuple(f'{phase}_ms' for phase in PHASES)
+                                  + ('frame_ms',))
+
+    def start_frame(self):
+        """Отмечает начало кадра."""
+        self._frame_start = self._last = time.perf_counter()
+        self._current = dict.fromkeys(PHASES, 0.0)
+
+    def mark(self, phase: str):
+        """Отмечает конец фазы: ей засчитывается время с предыдущей отметки."""
+        now = time.perf_counter()
+        self._current[phase] += (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self, ticks: int = 0):
+        """
+        Завершает кадр.
+
+        Args:
+            ticks: Количество тиков логики, выполненных за кадр.
+        """
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000
+        for phase in PHASES:
+            self.window[phase].append(self._current[phase])
+        self.window['frame'].append(frame_ms)
+        self.frames += 1
+        if self._writer is not None:
+            self._writer.writerow((self.frames, ticks)
+                                  + tuple(round(self._current[phase], 4) for phase in PHASES)
+                                  + (round(frame_ms, 4),))
+
+    def percentiles(self, phase: str) -> Tuple[float, ...]:
+        """Возвращает перцентили PERCENTILES времени фазы (мс) по последним кадрам."""
+        values = sorted(self.window[phase])
+        if not values:
+            return (0.0,) * len(PERCENTILES)
+        last = len(values) - 1
+        return tuple(values[min(last, len(values) * q // 100)] for q in PERCENTILES)
+
+    def close(self):
+        """Закрывает файл CSV."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -1,8 +1,11 @@
-from typing import Tuple, List
-import pygame
+from collections import deque
+from typing import Iterable, Optional, Tuple, List, TYPE_CHECKING
 import random
 from constants import *
 
+if TYPE_CHECKING:
+    import pygame
+
 class GameObject:
     """Базовый класс для игровых объектов."""
     
@@ -19,11 +22,67 @@ class GameObject:
             self.position = position
         self.body_color = None  # Должен быть переопределен в дочерних классах
 
-    def draw(self, surface: pygame.Surface):
+    def draw(self, surface: "pygame.Surface"):
         """Абстрактный метод для отрисовки объекта."""
         pass
 
 
+class FreeCells:
+    """Индекс свободных клеток поля с добавлением, удалением и выбором за O(1)."""
+
+    def __init__(self, occupied: Iterable[Tuple[int, int]] = ()):
+        """
+        Инициализация индекса всеми клетками поля, кроме занятых.
+
+        Args:
+            occupied: Клетки, которые изначально заняты.
+        """
+        self.cells = [(x * GRID_SIZE, y * GRID_SIZE)
+                      for y in range(GRID_HEIGHT) for x in range(GRID_WIDTH)]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        for cell in occupied:
+            self.remove(cell)
+
+    @classmethod
+    def from_cells(cls, cells: Iterable[Tuple[int, int]]) -> "FreeCells":
+        """
+        Создает индекс с заданными свободными клетками в заданном порядке.
+
+        Порядок клеток определяет результат sample(), поэтому для точного
+        восстановления игры его нужно сохранять.
+        """
+        free = cls.__new__(cls)
+        free.cells = list(cells)
+        free.index = {cell: i for i, cell in enumerate(free.cells)}
+        return free
+
+    def remove(self, cell: Tuple[int, int]):
+        """Помечает клетку занятой: на ее место в списке переносится последняя клетка."""
+        i = self.index.pop(cell)
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.index[last] = i
+
+    def add(self, cell: Tuple[int, int]):
+        """Помечает клетку свободной."""
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def sample(self, rng: random.Random = random) -> Tuple[int, int]:
+        """Возвращает случайную свободную клетку с равной вероятностью."""
+        return self.cells[rng.randrange(len(self.cells))]
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        """Проверяет, свободна ли клетка."""
+        return cell in self.index
+
+    def __len__(self) -> int:
+        """Возвращает количество свободных клеток."""
+        return len(self.cells)
+
+
 class Apple(GameObject):
     """Класс для представления яблока в игре."""
 
@@ -33,15 +92,28 @@ class Apple(GameObject):
         self.body_color = APPLE_COLOR
         self.randomize_position()
 
-    def randomize_position(self):
-        """Устанавливает случайную позицию для яблока в пределах игрового поля."""
+    def randomize_position(self, free_cells: Optional[FreeCells] = None,
+                           rng: random.Random = random):
+        """
+        Устанавливает случайную позицию для яблока в пределах игрового поля.
+
+        Args:
+            free_cells: Индекс свободных клеток. Если задан, яблоко ставится
+                только на свободную клетку (при полностью занятом поле позиция не меняется).
+            rng: Генератор случайных чисел (по умолчанию модуль random).
+        """
+        if free_cells is not None:
+            if free_cells:
+                self.position = free_cells.sample(rng)
+            return
         self.position = (
-            random.randint(0, GRID_WIDTH - 1) * GRID_SIZE,
-            random.randint(0, GRID_HEIGHT - 1) * GRID_SIZE
+            rng.randint(0, GRID_WIDTH - 1) * GRID_SIZE,
+            rng.randint(0, GRID_HEIGHT - 1) * GRID_SIZE
         )
 
-    def draw(self, surface: pygame.Surface):
+    def draw(self, surface: "pygame.Surface"):
         """Отрисовывает яблоко на игровой поверхности."""
+        import pygame  # pygame нужен только для отрисовки
         rect = pygame.Rect(self.position, (GRID_SIZE, GRID_SIZE))
         pygame.draw.rect(surface, self.body_color, rect)
         pygame.draw.rect(surface, SCREEN_COLOR, rect, 1)
@@ -59,7 +131,11 @@ class Snake(GameObject):
     def reset(self):
         """Сбрасывает змейку в начальное состояние."""
         self.length = 1
-        self.positions = [((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))]
+        # Голова - первый элемент; дек дает O(1) добавление головы и удаление хвоста
+        self.positions = deque([((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))])
+        # Множество занятых клеток для проверки столкновений за O(1)
+        self.occupied = set(self.positions)
+        self.free_cells = FreeCells(self.positions)
         self.direction = RIGHT
         self.next_direction = None
 
@@ -75,24 +151,40 @@ class Snake(GameObject):
         """Возвращает позицию головы змейки."""
         return self.positions[0]
 
-    def move(self):
-        """Перемещает змейку в текущем направлении."""
+    def occupies(self, position: Tuple[int, int]) -> bool:
+        """Проверяет, занята ли клетка телом змейки."""
+        return position in self.occupied
+
+    def move(self) -> bool:
+        """
+        Перемещает змейку в текущем направлении.
+
+        Returns:
+            False, если змейка столкнулась с собой и была сброшена, иначе True.
+        """
         head_x, head_y = self.get_head_position()
         dir_x, dir_y = self.direction
         new_x = (head_x + (dir_x * GRID_SIZE)) % SCREEN_WIDTH
         new_y = (head_y + (dir_y * GRID_SIZE)) % SCREEN_HEIGHT
         new_position = (new_x, new_y)
 
-        # Проверяем столкновение с собой
-        if new_position in self.positions[1:]:
+        # Проверяем столкновение с собой (голова не может совпасть с новой позицией)
+        if new_position in self.occupied:
             self.reset()
+            return False
         else:
-            self.positions.insert(0, new_position)
+            self.positions.appendleft(new_position)
+            self.occupied.add(new_position)
+            self.free_cells.remove(new_position)
             if len(self.positions) > self.length:
-                self.positions.pop()
+                tail = self.positions.pop()
+                self.occupied.discard(tail)
+                self.free_cells.add(tail)
+            return True
 
-    def draw(self, surface: pygame.Surface):
+    def draw(self, surface: "pygame.Surface"):
         """Отрисовывает змейку на игровой поверхности."""
+        import pygame  # pygame нужен только для отрисовки
         for position in self.positions:
             rect = pygame.Rect(position, (GRID_SIZE, GRID_SIZE))
             pygame.draw.rect(surface, self.body_color, rect)
@@ -1,44 +1,110 @@
+import argparse
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
 import pygame
-from game_objects import Snake, Apple
-from utils import handle_keys
+from snake_env import SnakeEnv
+from renderer import IncrementalRenderer, StatsOverlay
+from frame_stats import FrameStats
+from utils import poll_directions
+from autopilot import Autopilot
 from constants import *
 
-def main():
-    """Основная функция игры."""
-    # Настройка экрана
-    pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption('Змейка')
+# Длительность тика логики и ограничения цикла
+TICK = 1.0 / FPS
+MAX_FRAME_TIME = 0.25  # после долгой паузы не догоняем больше этого времени
+RENDER_FPS = 60
+
+def next_action(pending: Deque[Tuple[int, int]], direction: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Выбирает направление для очередного тика из очереди нажатий.
+
+    Нажатия, не меняющие направление (повтор или разворот), пропускаются,
+    чтобы каждое осмысленное нажатие применялось на своем тике.
+    """
+    while pending:
+        candidate = pending.popleft()
+        if candidate != direction and candidate != (-direction[0], -direction[1]):
+            return candidate
+    return None
+
+def main(overlay: bool = False, log_path: Optional[str] = None, autopilot: Optional[Autopilot] = None):
+    """
+    Основная функция игры.
+
+    Логика выполняется тиками фиксированной длительности TICK независимо от
+    частоты кадров: медленный кадр не замедляет игру, а догоняется несколькими
+    тиками. Отрисовка выполняется раз в кадр.
+
+    Args:
+        overlay: Показывать панель со временем фаз кадра.
+        log_path: Файл CSV для записи времени фаз каждого кадра.
+        autopilot: Автопилот, управляющий змейкой, когда нет нажатий клавиш.
+    """
+    # Настройка экрана: отрисовка подключается к игровой логике как наблюдатель
+    renderer = IncrementalRenderer('Змейка')
     clock = pygame.time.Clock()
+    stats = FrameStats(csv_path=log_path)
+    panel = StatsOverlay(stats) if overlay else None
+
+    # Создание игры: после каждого тика рендерер запоминает изменившиеся клетки
+    env = SnakeEnv(observers=[renderer.track])
+    # Очередь без ограничения длины: ни одно нажатие не теряется
+    pending: Deque[Tuple[int, int]] = deque()
+    accumulator = 0.0
+    previous = time.perf_counter()
 
-    # Создание объектов
-    snake = Snake()
-    apple = Apple()
+    try:
+        while True:
+            stats.start_frame()
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
 
-    while True:
-        # Обработка событий
-        handle_keys(snake)
+            # Обработка событий: все нажатия попадают в очередь
+            pending.extend(poll_directions())
+            stats.mark('input')
 
-        # Обновление состояния игры
-        snake.update_direction()
-        snake.move()
+            # Обновление состояния игры фиксированными тиками
+            ticks = 0
+            while accumulator >= TICK:
+                action = next_action(pending, env.snake.direction)
+                if action is None and autopilot is not None:
+                    action = autopilot(env)
+                _, _, done, _ = env.step(action)
+                if done:
+                    env.reset()
+                    if autopilot is not None:
+                        autopilot.reset()
+                accumulator -= TICK
+                ticks += 1
+            stats.mark('update')
 
-        # Проверка съедания яблока
-        if snake.get_head_position() == apple.position:
-            snake.length += 1
-            apple.randomize_position()
-            # Убедимся, что яблоко не появилось на змейке
-            while apple.position in snake.positions:
-                apple.randomize_position()
+            # Отрисовка
+            if panel is not None:
+                renderer.invalidate(panel.rect)
+            rects = renderer.draw(env)
+            if panel is not None:
+                rect = panel.draw(renderer.screen, now)
+                if rects is not None:
+                    rects.append(rect)
+            stats.mark('draw')
 
-        # Отрисовка
-        screen.fill(SCREEN_COLOR)
-        snake.draw(screen)
-        apple.draw(screen)
-        pygame.display.update()
+            renderer.flip(rects)
+            stats.mark('flip')
+            stats.end_frame(ticks)
 
-        # Контроль FPS
-        clock.tick(FPS)
+            # Ограничение частоты кадров (не влияет на скорость игры)
+            clock.tick(RENDER_FPS)
+    finally:
+        stats.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Змейка')
+    parser.add_argument('--overlay', action='store_true', help='показывать время фаз кадра')
+    parser.add_argument('--log', metavar='CSV', help='записывать время фаз кадра в CSV')
+    parser.add_argument('--autopilot', action='store_true', help='змейкой управляет автопилот')
+    parser.add_argument('--budget', type=int, default=2000, metavar='МКС',
+                        help='бюджет времени автопилота на тик в микросекундах')
+    args = parser.parse_args()
+    main(args.overlay, args.log, Autopilot(args.budget) if args.autopilot else None)
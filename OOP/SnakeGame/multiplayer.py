@@ -0,0 +1,330 @@
+import random
+import struct
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from constants import *
+from game_objects import FreeCells
+from snake_env import SnakeEnv
+
+# Типы сообщений сервера
+MSG_WELCOME = 0
+MSG_DELTA = 1
+# Клетка отсутствует (например, яблоку некуда встать)
+NO_CELL = 0xFFFF
+
+_FRAME = struct.Struct('<I')  # длина сообщения
+_WELCOME = struct.Struct('<BHIHHHH')  # тип, игрок, тик, ширина, высота, яблок, змеек
+_DELTA = struct.Struct('<BIHHHH')  # тип, тик, гибели, хвосты, головы, яблоки
+
+# Индекс противоположного направления для каждого индекса SnakeEnv.ACTIONS
+_OPPOSITE = tuple(SnakeEnv.ACTIONS.index((-dx, -dy)) for dx, dy in SnakeEnv.ACTIONS)
+
+
+class Delta:
+    """Изменения поля за один тик."""
+
+    def __init__(self, tick: int):
+        """
+        Инициализация пустых изменений.
+
+        Args:
+            tick: Номер тика.
+        """
+        self.tick = tick
+        self.deaths: List[int] = []  # игроки, чьи змейки убраны с поля целиком
+        self.tails: List[int] = []  # освобожденные клетки хвостов
+        self.heads: List[Tuple[int, int]] = []  # (игрок, новая голова); голова без тела - появление
+        self.apples: List[Tuple[int, int]] = []  # (номер яблока, новая клетка)
+
+
+class PlayerSnake:
+    """Змейка игрока на общем поле."""
+
+    def __init__(self, cell: int, direction: int):
+        """
+        Инициализация змейки длины 1.
+
+        Args:
+            cell: Клетка головы.
+            direction: Индекс направления в SnakeEnv.ACTIONS.
+        """
+        self.body: Deque[int] = deque([cell])
+        self.length = 1
+        self.direction = direction
+        self.next_direction: Optional[int] = None
+        self.score = 0
+
+
+class MultiplayerGame:
+    """
+    Общее поле змейки для многих игроков.
+
+    Клетка поля задается индексом y * width + x. Все изменения (вход,
+    выход и повороты игроков) накапливаются и применяются в tick(), поэтому
+    между тиками состояние поля совпадает с результатом последнего тика
+    и снимок для нового клиента согласован с последующими изменениями.
+    Столкновение с любой занятой клеткой или лобовое столкновение голов
+    убирает змейку, игрок появляется заново в случайной свободной клетке.
+    """
+
+    def __init__(self, width: int = GRID_WIDTH, height: int = GRID_HEIGHT,
+                 apples: int = 1, seed: Optional[int] = None):
+        """
+        Инициализация поля.
+
+        Args:
+            width: Ширина поля в клетках.
+            height: Высота поля в клетках.
+            apples: Количество яблок на поле.
+            seed: Зерно генератора случайных чисел.
+        """
+        if width * height >= NO_CELL:
+            raise ValueError("Поле слишком большое для 16-битных индексов клеток")
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.tick_count = 0
+        self.players: Dict[int, PlayerSnake] = {}
+        self.owner: Dict[int, int] = {}  # клетка -> игрок
+        self.free = FreeCells.from_cells(range(width * height))
+        self.apples: List[int] = []
+        for _ in range(apples):
+            self.apples.append(self._spawn_cell())
+        self._next_id = 0
+        self._joining: List[int] = []
+        self._leaving: Set[int] = set()
+        self._respawn: List[int] = []
+
+    def join(self) -> int:
+        """
+        Регистрирует игрока, змейка появится на следующем тике.
+
+        Returns:
+            Номер игрока.
+
+        Raises:
+            RuntimeError: Все 16-битные номера игроков заняты.
+        """
+        # Номер занят, пока тик не убрал игрока с поля; игроки на поле,
+        # ожидающие появления и ожидающие возрождения не пересекаются
+        if len(self.players) + len(self._joining) + len(self._respawn) >= NO_CELL:
+            raise RuntimeError("Все номера игроков заняты")
+        player = self._next_id
+        if player in self.players or player in self._joining or player in self._respawn:
+            # Номера пошли по второму кругу: пропускаются занятые
+            used = set(self.players)
+            used.update(self._joining, self._respawn)
+            while player in used:
+                player = (player + 1) % NO_CELL
+        self._next_id = (player + 1) % NO_CELL
+        self._joining.append(player)
+        return player
+
+    def leave(self, player: int):
+        """Убирает игрока с поля на следующем тике."""
+        self._leaving.add(player)
+
+    def turn(self, player: int, action: int):
+        """
+        Задает направление змейки на следующий тик.
+
+        Args:
+            player: Номер игрока.
+            action: Индекс направления в SnakeEnv.ACTIONS.
+        """
+        snake = self.players.get(player)
+        if snake is not None:
+            snake.next_direction = action
+
+    def _neighbor(self, cell: int, action: int) -> int:
+        """Соседняя клетка в направлении action с переходом через края."""
+        dx, dy = SnakeEnv.ACTIONS[action]
+        y, x = divmod(cell, self.width)
+        return (y + dy) % self.height * self.width + (x + dx) % self.width
+
+    def _spawn_cell(self) -> int:
+        """Случайная свободная клетка без яблока или NO_CELL."""
+        for _ in range(8):
+            if not self.free:
+                break
+            cell = self.free.sample(self.rng)
+            if cell not in self.apples:
+                return cell
+        return NO_CELL
+
+    def _remove(self, player: int, delta: Delta):
+        """Убирает змейку игрока с поля."""
+        snake = self.players.pop(player)
+        for cell in snake.body:
+            del self.owner[cell]
+            self.free.add(cell)
+        delta.deaths.append(player)
+
+    def _spawn(self, player: int, delta: Delta) -> bool:
+        """Ставит новую змейку игрока в случайную свободную клетку."""
+        cell = self._spawn_cell()
+        if cell == NO_CELL:
+            return False
+        self.players[player] = PlayerSnake(cell, self.rng.randrange(len(SnakeEnv.ACTIONS)))
+        self.owner[cell] = player
+        self.free.remove(cell)
+        delta.heads.append((player, cell))
+        return True
+
+    def tick(self) -> Delta:
+        """Выполняет один тик для всех игроков и возвращает изменения поля."""
+        self.tick_count += 1
+        delta = Delta(self.tick_count)
+
+        leaving, self._leaving = self._leaving, set()
+        for player in leaving:
+            if player in self.players:
+                self._remove(player, delta)
+        self._joining = [player for player in self._joining if player not in leaving]
+        self._respawn = [player for player in self._respawn if player not in leaving]
+
+        # Новые головы; столкновение проверяется до освобождения хвостов, как в Snake.move
+        targets: Dict[int, int] = {}
+        claimed: Dict[int, int] = {}
+        for player, snake in self.players.items():
+            action = snake.next_direction
+            if action is not None:
+                # Разворот в обратную сторону игнорируется
+                if action != _OPPOSITE[snake.direction]:
+                    snake.direction = action
+                snake.next_direction = None
+            cell = self._neighbor(snake.body[0], snake.direction)
+            targets[player] = cell
+            claimed[cell] = claimed.get(cell, 0) + 1
+        crashed = [player for player, cell in targets.items() if cell in self.owner or claimed[cell] > 1]
+        for player in crashed:
+            self._remove(player, delta)
+            self._respawn.append(player)
+
+        eaten = []
+        for player, snake in self.players.items():
+            cell = targets[player]
+            snake.body.appendleft(cell)
+            self.owner[cell] = player
+            self.free.remove(cell)
+            delta.heads.append((player, cell))
+            if len(snake.body) > snake.length:
+                tail = snake.body.pop()
+                del self.owner[tail]
+                self.free.add(tail)
+                delta.tails.append(tail)
+            if cell in self.apples:
+                snake.length += 1
+                snake.score += 1
+                eaten.append(self.apples.index(cell))
+
+        for i in eaten:
+            self.apples[i] = NO_CELL
+        # Съеденное яблоко передается всегда, даже если ему некуда встать (NO_CELL)
+        for i, cell in enumerate(self.apples):
+            if cell == NO_CELL:
+                cell = self.apples[i] = self._spawn_cell()
+                if cell != NO_CELL or i in eaten:
+                    delta.apples.append((i, cell))
+
+        pending = self._joining + self._respawn
+        self._joining, self._respawn = [], []
+        for player in pending:
+            if not self._spawn(player, delta):
+                self._respawn.append(player)
+        return delta
+
+    def welcome(self, player: int) -> bytes:
+        """Кадр со снимком поля для нового клиента."""
+        parts = [_WELCOME.pack(MSG_WELCOME, player, self.tick_count, self.width, self.height,
+                               len(self.apples), len(self.players)),
+                 struct.pack(f'<{len(self.apples)}H', *self.apples)]
+        for other, snake in self.players.items():
+            parts.append(struct.pack(f'<HH{len(snake.body)}H', other, len(snake.body), *snake.body))
+        payload = b''.join(parts)
+        return _FRAME.pack(len(payload)) + payload
+
+
+def encode_delta(delta: Delta) -> bytes:
+    """
+    Кодирует изменения тика в кадр.
+
+    Кадр: длина (u32), заголовок, затем номера погибших игроков (u16),
+    клетки хвостов (u16), пары (игрок, голова) (u16, u16) и пары
+    (номер яблока, клетка) (u16, u16). Все числа - little-endian.
+    """
+    heads = [value for pair in delta.heads for value in pair]
+    apples = [value for pair in delta.apples for value in pair]
+    payload = (_DELTA.pack(MSG_DELTA, delta.tick, len(delta.deaths), len(delta.tails),
+                           len(delta.heads), len(delta.apples))
+               + struct.pack(f'<{len(delta.deaths) + len(delta.tails) + len(heads) + len(apples)}H',
+                             *delta.deaths, *delta.tails, *heads, *apples))
+    return _FRAME.pack(len(payload)) + payload
+
+
+def frame_length(header: bytes) -> int:
+    """Длина сообщения по 4-байтовому префиксу кадра."""
+    return _FRAME.unpack(header)[0]
+
+
+class BoardMirror:
+    """
+    Копия поля на стороне клиента, собираемая из снимка и изменений.
+
+    Владельца клетки хранит словарь, поэтому освобожденный хвост
+    снимается с конца змейки, которой он принадлежит.
+    """
+
+    def __init__(self):
+        """Инициализация пустой копии."""
+        self.player = -1
+        self.tick = 0
+        self.width = self.height = 0
+        self.apples: List[int] = []
+        self.snakes: Dict[int, Deque[int]] = {}
+        self.owner: Dict[int, int] = {}
+
+    def apply(self, payload: bytes):
+        """Применяет сообщение сервера (без префикса длины)."""
+        if payload[0] == MSG_WELCOME:
+            self._welcome(payload)
+            return
+        _, self.tick, deaths, tails, heads, apples = _DELTA.unpack_from(payload)
+        values = struct.unpack_from(f'<{deaths + tails + 2 * heads + 2 * apples}H', payload, _DELTA.size)
+        pos = 0
+        for player in values[pos:pos + deaths]:
+            for cell in self.snakes.pop(player, ()):
+                del self.owner[cell]
+        pos += deaths
+        for cell in values[pos:pos + tails]:
+            self.snakes[self.owner.pop(cell)].pop()
+        pos += tails
+        for i in range(pos, pos + 2 * heads, 2):
+            player, cell = values[i], values[i + 1]
+            self.snakes.setdefault(player, deque()).appendleft(cell)
+            self.owner[cell] = player
+        pos += 2 * heads
+        for i in range(pos, pos + 2 * apples, 2):
+            self.apples[values[i]] = values[i + 1]
+
+    def _welcome(self, payload: bytes):
+        """Загружает снимок поля."""
+        _, self.player, self.tick, self.width, self.height, apples, snakes = _WELCOME.unpack_from(payload)
+        pos = _WELCOME.size
+        self.apples = list(struct.unpack_from(f'<{apples}H', payload, pos))
+        pos += 2 * apples
+        self.snakes, self.owner = {}, {}
+        for _ in range(snakes):
+            player, size = struct.unpack_from('<HH', payload, pos)
+            body = deque(struct.unpack_from(f'<{size}H', payload, pos + 4))
+            pos += 4 + 2 * size
+            self.snakes[player] = body
+            for cell in body:
+                self.owner[cell] = player
+
+    def matches(self, game: MultiplayerGame) -> bool:
+        """Проверяет совпадение копии с полем сервера."""
+        return (self.tick == game.tick_count and self.apples == game.apples
+                and {player: list(body) for player, body in self.snakes.items()}
+                == {player: list(snake.body) for player, snake in game.players.items()})
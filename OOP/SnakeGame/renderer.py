@@ -0,0 +1,209 @@
+from typing import Dict, List, Optional, Set, Tuple
+import pygame
+from constants import *
+from snake_env import SnakeEnv
+from frame_stats import FrameStats, PHASES, PERCENTILES
+
+# Готовые плитки клеток: (цвет, размер) -> поверхность
+_tiles: Dict[Tuple[Tuple[int, int, int], int], pygame.Surface] = {}
+
+
+def cell_tile(color: Tuple[int, int, int], size: int = GRID_SIZE) -> pygame.Surface:
+    """
+    Возвращает плитку клетки с обводкой, нарисованную один раз на цвет и размер.
+
+    Args:
+        color: Цвет клетки.
+        size: Размер клетки в пикселях.
+    """
+    key = (color, size)
+    tile = _tiles.get(key)
+    if tile is None:
+        tile = pygame.Surface((size, size))
+        tile.fill(color)
+        pygame.draw.rect(tile, SCREEN_COLOR, tile.get_rect(), 1)
+        # Плитка в формате экрана копируется без преобразования пикселей
+        if pygame.display.get_surface() is not None:
+            tile = tile.convert()
+        _tiles[key] = tile
+    return tile
+
+
+class PygameRenderer:
+    """
+    Наблюдатель SnakeEnv, отрисовывающий игру в окне pygame.
+
+    Кадр строится в два этапа: draw() рисует на экранной поверхности и
+    возвращает измененные области, flip() выводит их на экран. Вызов
+    renderer(env) выполняет оба этапа.
+    """
+
+    def __init__(self, caption: str = 'Змейка'):
+        """
+        Создает окно игры.
+
+        Args:
+            caption: Заголовок окна.
+        """
+        pygame.init()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption(caption)
+
+    def track(self, env: SnakeEnv):
+        """Учитывает тик игры (полной перерисовке учитывать нечего)."""
+
+    def invalidate(self, rect: pygame.Rect):
+        """Помечает область для перерисовки (полная перерисовка обновляет все)."""
+
+    def draw(self, env: SnakeEnv) -> Optional[List[pygame.Rect]]:
+        """
+        Рисует кадр целиком одним пакетом копирований плиток.
+
+        Returns:
+            None - обновить нужно весь экран.
+        """
+        snake, apple = env.snake, env.apple
+        self.screen.fill(SCREEN_COLOR)
+        tile = cell_tile(snake.body_color)
+        self.screen.blits([(tile, position) for position in snake.positions], False)
+        self.screen.blit(cell_tile(apple.body_color), apple.position)
+        return None
+
+    def flip(self, rects: Optional[List[pygame.Rect]]):
+        """
+        Выводит нарисованное на экран.
+
+        Args:
+            rects: Измененные области или None для всего экрана.
+        """
+        if rects is None:
+            pygame.display.update()
+        elif rects:
+            pygame.display.update(rects)
+
+    def __call__(self, env: SnakeEnv):
+        """Отрисовывает и выводит кадр по текущему состоянию среды."""
+        self.track(env)
+        self.flip(self.draw(env))
+
+
+class IncrementalRenderer(PygameRenderer):
+    """
+    Отрисовка только изменившихся клеток.
+
+    За тик меняются не более трех клеток: новая голова, освободившийся хвост
+    и яблоко. track() вызывается после каждого тика и накапливает эти клетки,
+    draw() перерисовывает их по текущему состоянию, и только они передаются
+    в display.update, поэтому стоимость кадра не зависит от длины змейки.
+    Между кадрами может пройти несколько тиков. Кадр целиком рисуется
+    при первом вызове, по окончании игры и после сброса.
+    """
+
+    def __init__(self, caption: str = 'Змейка'):
+        """
+        Создает окно игры.
+
+        Args:
+            caption: Заголовок окна.
+        """
+        super().__init__(caption)
+        self._head: Optional[Tuple[int, int]] = None
+        self._tail: Optional[Tuple[int, int]] = None
+        self._apple: Optional[Tuple[int, int]] = None
+        self._dirty: Set[Tuple[int, int]] = set()
+        self._full = True
+
+    def track(self, env: SnakeEnv):
+        """Запоминает клетки, изменившиеся за тик."""
+        snake, apple = env.snake, env.apple
+        head, tail = snake.positions[0], snake.positions[-1]
+        if env.ticks == 0 or env.done:
+            self._full = True
+        elif not self._full:
+            self._dirty.update((head, self._tail, self._apple, apple.position))
+        self._head, self._tail, self._apple = head, tail, apple.position
+
+    def invalidate(self, rect: pygame.Rect):
+        """Помечает для перерисовки все клетки, пересекающие область."""
+        left = rect.left // GRID_SIZE * GRID_SIZE
+        top = rect.top // GRID_SIZE * GRID_SIZE
+        self._dirty.update((x, y)
+                           for x in range(left, min(rect.right, SCREEN_WIDTH), GRID_SIZE)
+                           for y in range(top, min(rect.bottom, SCREEN_HEIGHT), GRID_SIZE))
+
+    def draw(self, env: SnakeEnv) -> Optional[List[pygame.Rect]]:
+        """
+        Перерисовывает накопленные клетки по текущему состоянию среды.
+
+        Returns:
+            Прямоугольники перерисованных клеток или None при полной перерисовке.
+        """
+        dirty, self._dirty = self._dirty, set()
+        if self._full:
+            self._full = False
+            return super().draw(env)
+
+        snake, apple = env.snake, env.apple
+        snake_tile = cell_tile(snake.body_color)
+        apple_tile = cell_tile(apple.body_color)
+        rects = []
+        for cell in dirty:
+            if snake.occupies(cell):
+                rects.append(self.screen.blit(snake_tile, cell))
+            elif cell == apple.position:
+                rects.append(self.screen.blit(apple_tile, cell))
+            else:
+                rects.append(self.screen.fill(SCREEN_COLOR, (cell, (GRID_SIZE, GRID_SIZE))))
+        return rects
+
+
+class StatsOverlay:
+    """Панель поверх кадра с перцентилями времени фаз кадра."""
+
+    def __init__(self, stats: FrameStats, refresh: float = 0.5):
+        """
+        Инициализация панели.
+
+        Args:
+            stats: Статистика времени кадров.
+            refresh: Период обновления текста в секундах.
+        """
+        self.stats = stats
+        self.refresh = refresh
+        self.font = pygame.font.Font(None, 18)
+        self._surface: Optional[pygame.Surface] = None
+        self._updated = 0.0
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    def _render(self):
+        """Перестраивает текст панели."""
+        lines = [f"{phase:<7}" + '  '.join(f"p{q} {value:5.2f}" for q, value in
+                                            zip(PERCENTILES, self.stats.percentiles(phase)))
+                 for phase in PHASES]
+        lines.append(f"кадр p95 {self.stats.percentiles('frame')[1]:5.2f} мс")
+        images = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(image.get_width() for image in images) + 8
+        height = sum(image.get_height() for image in images) + 8
+        surface = pygame.Surface((width, height))
+        y = 4
+        for image in images:
+            surface.blit(image, (4, y))
+            y += image.get_height()
+        self._surface = surface
+        self.rect = surface.get_rect(topleft=(4, 4))
+
+    def draw(self, screen: pygame.Surface, now: float) -> pygame.Rect:
+        """
+        Рисует панель поверх кадра.
+
+        Args:
+            screen: Экранная поверхность.
+            now: Текущее время в секундах (для периодического обновления текста).
+
+        Returns:
+            Прямоугольник панели.
+        """
+        if self._surface is None or now - self._updated >= self.refresh:
+            self._render()
+            self._updated = now
+        return screen.blit(self._surface, self.rect)
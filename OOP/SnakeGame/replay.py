@@ -0,0 +1,350 @@
+import struct
+import time
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from constants import FPS, GRID_SIZE, GRID_WIDTH
+from game_objects import FreeCells
+from snake_env import SnakeEnv
+
+_MAGIC = b'SNKR'
+_VERSION = 2
+_HEADER = struct.Struct('<4sBqI')  # сигнатура, версия, зерно, число тиков
+_RNG_STATE = struct.Struct('<625I')  # внутреннее состояние random.Random (MT19937 и позиция)
+_GAUSS = struct.Struct('<?d')  # есть ли сохраненное значение gauss, само значение
+
+Snapshot = Tuple[int, Tuple[Tuple[int, int], ...], int, Tuple[int, int], Tuple[int, int], int, Any,
+                 Tuple[Tuple[int, int], ...]]
+
+
+def _write_varint(out: bytearray, value: int):
+    """Записывает неотрицательное целое в формате varint (7 бит на байт)."""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Читает varint, возвращает значение и позицию после него."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _cell(position: Tuple[int, int]) -> int:
+    """Номер клетки поля по координатам в пикселях."""
+    x, y = position
+    return y // GRID_SIZE * GRID_WIDTH + x // GRID_SIZE
+
+
+def _position(cell: int) -> Tuple[int, int]:
+    """Координаты в пикселях по номеру клетки поля."""
+    y, x = divmod(cell, GRID_WIDTH)
+    return x * GRID_SIZE, y * GRID_SIZE
+
+
+def _write_cells(out: bytearray, cells: Tuple[Tuple[int, int], ...]):
+    """Записывает количество клеток и их номера."""
+    _write_varint(out, len(cells))
+    for position in cells:
+        _write_varint(out, _cell(position))
+
+
+def _read_cells(data: bytes, pos: int) -> Tuple[Tuple[Tuple[int, int], ...], int]:
+    """Читает клетки, записанные _write_cells."""
+    count, pos = _read_varint(data, pos)
+    cells = []
+    for _ in range(count):
+        cell, pos = _read_varint(data, pos)
+        cells.append(_position(cell))
+    return tuple(cells), pos
+
+
+def _write_snapshot(out: bytearray, state: Snapshot):
+    """Записывает ключевой кадр (около 4 КБ, в основном состояние генератора)."""
+    ticks, positions, length, direction, apple, score, rng_state, free_cells = state
+    for value in (ticks, length, score, SnakeEnv.ACTIONS.index(direction), _cell(apple)):
+        _write_varint(out, value)
+    _write_cells(out, positions)
+    _write_cells(out, free_cells)
+    _, internal, gauss = rng_state
+    out += _RNG_STATE.pack(*internal)
+    out += _GAUSS.pack(gauss is not None, gauss or 0.0)
+
+
+def _read_snapshot(data: bytes, pos: int) -> Tuple[Snapshot, int]:
+    """Читает ключевой кадр, записанный _write_snapshot."""
+    values = []
+    for _ in range(5):
+        value, pos = _read_varint(data, pos)
+        values.append(value)
+    ticks, length, score, action, apple = values
+    positions, pos = _read_cells(data, pos)
+    free_cells, pos = _read_cells(data, pos)
+    internal = _RNG_STATE.unpack_from(data, pos)
+    pos += _RNG_STATE.size
+    has_gauss, gauss = _GAUSS.unpack_from(data, pos)
+    pos += _GAUSS.size
+    rng_state = (3, internal, gauss if has_gauss else None)
+    return (ticks, positions, length, SnakeEnv.ACTIONS[action], _position(apple), score,
+            rng_state, free_cells), pos
+
+
+def snapshot(env: SnakeEnv) -> Snapshot:
+    """Снимок состояния игры для ключевого кадра (включая порядок свободных клеток)."""
+    snake = env.snake
+    return (env.ticks, tuple(snake.positions), snake.length, snake.direction,
+            env.apple.position, env.score, env.rng.getstate(), tuple(snake.free_cells.cells))
+
+
+def restore(env: SnakeEnv, state: Snapshot):
+    """Восстанавливает состояние игры из снимка."""
+    ticks, positions, length, direction, apple, score, rng_state, free_cells = state
+    snake = env.snake
+    snake.positions = deque(positions)
+    snake.occupied = set(positions)
+    snake.free_cells = FreeCells.from_cells(free_cells)
+    snake.length = length
+    snake.direction = direction
+    snake.next_direction = None
+    env.apple.position = apple
+    env.score = score
+    env.ticks = ticks
+    env.done = False
+    env.rng.setstate(rng_state)
+
+
+class Replay:
+    """
+    Запись одной игры: зерно и поток смен направления (тик, направление).
+
+    В файл пишется зерно и поток событий: разница тиков и индекс
+    направления упакованы в одно число varint, поэтому поворот занимает
+    1-2 байта. Ключевые кадры ускоряют перемотку, но каждый занимает около
+    4 КБ, поэтому по умолчанию в файл не пишутся: после загрузки такой записи
+    первая перемотка к тику t пересчитывает игру с начала за O(t), дальше
+    используются созданные при этом кадры. Запись с with_keyframes=True
+    перематывается сразу за O(интервал кадров).
+    """
+
+    def __init__(self, seed: int, events: Optional[List[Tuple[int, int]]] = None, ticks: int = 0):
+        """
+        Инициализация записи.
+
+        Args:
+            seed: Зерно, с которым начата игра.
+            events: Смены направления: (тик, индекс в SnakeEnv.ACTIONS).
+            ticks: Длительность игры в тиках.
+        """
+        self.seed = seed
+        self.events = events if events is not None else []
+        self.ticks = ticks
+        self.keyframes: List[Snapshot] = []
+
+    def to_bytes(self, with_keyframes: bool = False) -> bytes:
+        """
+        Сериализует запись в компактный двоичный формат.
+
+        Args:
+            with_keyframes: Сохранить и ключевые кадры.
+        """
+        out = bytearray(_HEADER.pack(_MAGIC, _VERSION, self.seed, self.ticks))
+        _write_varint(out, len(self.events))
+        previous = 0
+        for tick, action in self.events:
+            _write_varint(out, (tick - previous) << 2 | action)
+            previous = tick
+        keyframes = self.keyframes if with_keyframes else []
+        _write_varint(out, len(keyframes))
+        for state in keyframes:
+            _write_snapshot(out, state)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        """Восстанавливает запись из двоичного формата."""
+        magic, version, seed, ticks = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version not in (1, _VERSION):
+            raise ValueError("Неизвестный формат записи игры")
+        pos = _HEADER.size
+        # В версии 1 события занимают весь остаток файла
+        if version == 1:
+            count = None
+        else:
+            count, pos = _read_varint(data, pos)
+        events = []
+        tick = 0
+        while len(events) != count and pos < len(data):
+            value, pos = _read_varint(data, pos)
+            tick += value >> 2
+            events.append((tick, value & 3))
+        replay = cls(seed, events, ticks)
+        if version > 1:
+            count, pos = _read_varint(data, pos)
+            for _ in range(count):
+                state, pos = _read_snapshot(data, pos)
+                replay.keyframes.append(state)
+        return replay
+
+    def save(self, path: str, with_keyframes: bool = False):
+        """Сохраняет запись в файл (см. to_bytes)."""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(with_keyframes))
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        """Загружает запись из файла."""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """
+    Наблюдатель SnakeEnv, записывающий игру в Replay.
+
+    Записывается одна игра, начатая с заданным зерном. Зерно следующей
+    игры после env.reset() неизвестно (без зерна генератор продолжает
+    последовательность), поэтому на ней запись завершается.
+    """
+
+    def __init__(self, env: SnakeEnv, seed: int, keyframe_interval: int = 500):
+        """
+        Начинает новую игру с заданным зерном и подключается к среде.
+
+        Args:
+            env: Среда игры.
+            seed: Зерно новой игры.
+            keyframe_interval: Интервал ключевых кадров в тиках.
+        """
+        self.env = env
+        self.keyframe_interval = keyframe_interval
+        self.replay = Replay(seed)
+        self.recording = False
+        env.observers.append(self)
+        env.reset(seed)
+
+    def __call__(self, env: SnakeEnv):
+        """Записывает смену направления и ключевые кадры."""
+        replay = self.replay
+        if env.ticks == 0:
+            # Первый вызов - из reset(seed) в конструкторе, следующий - уже новая игра
+            if replay.keyframes:
+                self.recording = False
+                return
+            self.recording = True
+            replay.keyframes = [snapshot(env)]
+            self._direction = env.direction
+            return
+        if not self.recording:
+            return
+        # Поворот на смертельном ходу тоже записывается, иначе гибель не воспроизвести
+        direction = env.direction
+        if direction != self._direction:
+            replay.events.append((env.ticks, SnakeEnv.ACTIONS.index(direction)))
+            self._direction = direction
+        if env.ticks % self.keyframe_interval == 0 and not env.done:
+            replay.keyframes.append(snapshot(env))
+        replay.ticks = env.ticks
+
+    def finish(self) -> Replay:
+        """Отключается от среды и возвращает запись."""
+        self.env.observers.remove(self)
+        return self.replay
+
+
+class ReplayPlayer:
+    """
+    Воспроизведение записи через SnakeEnv.
+
+    Игра пересчитывается по зерну и событиям без отрисовки с максимальной
+    скоростью или с наблюдателями (например, рендерером) в темпе, кратном FPS.
+    Перемотка восстанавливает ближайший предшествующий ключевой кадр и
+    досчитывает оставшиеся тики.
+    """
+
+    def __init__(self, replay: Replay, observers: Optional[List[Callable[[SnakeEnv], Any]]] = None,
+                 keyframe_interval: int = 500):
+        """
+        Инициализация воспроизведения.
+
+        Args:
+            replay: Запись игры.
+            observers: Наблюдатели среды (например, рендерер).
+            keyframe_interval: Интервал ключевых кадров, создаваемых при воспроизведении,
+                если в записи их нет.
+        """
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self._actions: Dict[int, Tuple[int, int]] = {
+            tick: SnakeEnv.ACTIONS[action] for tick, action in replay.events}
+        self.env = SnakeEnv(replay.seed)
+        self.keyframes: Dict[int, Snapshot] = {state[0]: state for state in replay.keyframes}
+        self.keyframes.setdefault(0, snapshot(self.env))
+        self._keyframe_ticks = sorted(self.keyframes)
+        self.env.observers.extend(observers or [])
+
+    @property
+    def tick(self) -> int:
+        """Текущий тик воспроизведения."""
+        return self.env.ticks
+
+    def step(self) -> bool:
+        """
+        Выполняет один тик записи.
+
+        Returns:
+            False, если запись закончилась.
+        """
+        env = self.env
+        if env.ticks >= self.replay.ticks or env.done:
+            return False
+        env.step(self._actions.get(env.ticks + 1))
+        if env.ticks % self.keyframe_interval == 0 and env.ticks not in self.keyframes and not env.done:
+            self.keyframes[env.ticks] = snapshot(env)
+            self._keyframe_ticks.insert(bisect_right(self._keyframe_ticks, env.ticks), env.ticks)
+        return True
+
+    def run(self) -> SnakeEnv:
+        """Воспроизводит запись до конца с максимальной скоростью и возвращает среду."""
+        while self.step():
+            pass
+        return self.env
+
+    def play(self, speed: float = 1.0):
+        """
+        Воспроизводит запись в реальном времени.
+
+        Args:
+            speed: Множитель скорости относительно FPS.
+        """
+        interval = 1.0 / (FPS * speed)
+        next_time = time.perf_counter()
+        while self.step():
+            next_time += interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def seek(self, tick: int):
+        """
+        Переходит к заданному тику.
+
+        Args:
+            tick: Номер тика (ограничивается длительностью записи).
+        """
+        tick = max(0, min(tick, self.replay.ticks))
+        nearest = self._keyframe_ticks[bisect_right(self._keyframe_ticks, tick) - 1]
+        # Восстанавливаем ключевой кадр, если он ближе текущей позиции или перемотка назад
+        if tick < self.env.ticks or nearest > self.env.ticks or self.env.done:
+            observers, self.env.observers = self.env.observers, []
+            restore(self.env, self.keyframes[nearest])
+            self.env.observers = observers
+        while self.env.ticks < tick and self.step():
+            pass
@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from constants import *
+from multiplayer import MultiplayerGame, encode_delta
+
+
+class GameServer:
+    """
+    Авторитетный сервер многопользовательской змейки на asyncio.
+
+    Сервер сам выполняет тики с частотой tick_rate. Клиент по TCP получает
+    снимок поля при подключении, затем кадр изменений на каждом тике (см.
+    encode_delta). Кадр кодируется один раз и отправляется всем клиентам.
+    Клиент посылает по одному байту на поворот - индекс направления в
+    SnakeEnv.ACTIONS. Клиент, не успевающий читать (буфер отправки больше
+    max_buffer), отключается, чтобы не задерживать остальных.
+    """
+
+    def __init__(self, game: MultiplayerGame, tick_rate: float = FPS, max_buffer: int = 1 << 20,
+                 backlog: int = 1024):
+        """
+        Инициализация сервера.
+
+        Args:
+            game: Игровое поле.
+            tick_rate: Частота тиков в секунду.
+            max_buffer: Предел неотправленных байт на клиента.
+            backlog: Очередь подключений (сотни ботов подключаются одновременно).
+        """
+        self.game = game
+        self.tick_rate = tick_rate
+        self.max_buffer = max_buffer
+        self.backlog = backlog
+        self._writers: Dict[int, asyncio.StreamWriter] = {}
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        # Метрики
+        self.ticks = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+        self._tick_ms = deque(maxlen=1000)
+        self._started = 0.0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 9000):
+        """Открывает порт и запускает цикл тиков."""
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=self.backlog)
+        self._started = time.perf_counter()
+        self._loop_task = asyncio.create_task(self._tick_loop())
+
+    @property
+    def port(self) -> int:
+        """Фактический порт (полезно при запуске на порту 0)."""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Работает до отмены."""
+        await self._loop_task
+
+    async def stop_ticks(self):
+        """Останавливает цикл тиков, соединения остаются открытыми."""
+        self._loop_task.cancel()
+        try:
+            await self._loop_task
+        except asyncio.CancelledError:
+            pass
+
+    async def stop(self):
+        """Останавливает цикл тиков и закрывает соединения."""
+        await self.stop_ticks()
+        self._server.close()
+        for writer in list(self._writers.values()):
+            writer.close()
+        await self._server.wait_closed()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Количество тиков и их частота, время тика, трафик и число игроков."""
+        elapsed = time.perf_counter() - self._started
+        tick_ms = sorted(self._tick_ms)
+        return {
+            'ticks': self.ticks,
+            'ticks_per_second': self.ticks / elapsed if elapsed else 0.0,
+            'tick_ms_p50': tick_ms[len(tick_ms) // 2] if tick_ms else 0.0,
+            'tick_ms_p99': tick_ms[min(len(tick_ms) - 1, len(tick_ms) * 99 // 100)] if tick_ms else 0.0,
+            'players': len(self._writers),
+            'dropped': self.dropped,
+            'bytes_sent': self.bytes_sent,
+            'bytes_per_second': self.bytes_sent / elapsed if elapsed else 0.0,
+        }
+
+    async def _tick_loop(self):
+        """Выполняет тики с фиксированным шагом и рассылает изменения."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            started = time.perf_counter()
+            frame = encode_delta(self.game.tick())
+            for player, writer in list(self._writers.items()):
+                if writer.transport.get_write_buffer_size() > self.max_buffer:
+                    self._drop(player)
+                    self.dropped += 1
+                    continue
+                writer.write(frame)
+                self.bytes_sent += len(frame)
+            self.ticks += 1
+            self._tick_ms.append((time.perf_counter() - started) * 1000)
+
+            # Отстающий сервер не копит долг тиков, а продолжает с текущего момента
+            next_tick = max(next_tick + interval, loop.time())
+            await asyncio.sleep(next_tick - loop.time())
+
+    def _drop(self, player: int):
+        """Отключает клиента и убирает его змейку."""
+        writer = self._writers.pop(player, None)
+        if writer is not None:
+            self.game.leave(player)
+            writer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обслуживает одного клиента: снимок поля, затем прием поворотов."""
+        try:
+            player = self.game.join()
+        except RuntimeError:
+            # Свободных номеров игроков нет: соединение отклоняется
+            writer.close()
+            return
+        # Снимок и регистрация без await между ними: следующий кадр клиента - ближайший тик
+        welcome = self.game.welcome(player)
+        writer.write(welcome)
+        self.bytes_sent += len(welcome)
+        self._writers[player] = writer
+        try:
+            while True:
+                data = await reader.read(64)
+                if not data:
+                    break
+                # Из пачки нажатий действует последнее
+                self.game.turn(player, data[-1] & 3)
+        except ConnectionError:
+            pass
+        finally:
+            # Отмена (например, при остановке сервера) пробрасывается дальше
+            self._drop(player)
+
+
+async def main(host: str, port: int, tick_rate: float, width: int, height: int, apples: int):
+    """Запускает сервер и работает до прерывания."""
+    server = GameServer(MultiplayerGame(width, height, apples), tick_rate)
+    await server.start(host, port)
+    print(f"Сервер змейки на {host}:{server.port}, {tick_rate} тиков/с")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Сервер многопользовательской змейки')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--tick-rate', type=float, default=FPS, help='тиков в секунду')
+    parser.add_argument('--width', type=int, default=GRID_WIDTH, help='ширина поля в клетках')
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT, help='высота поля в клетках')
+    parser.add_argument('--apples', type=int, default=1, help='количество яблок')
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.host, args.port, args.tick_rate, args.width, args.height, args.apples))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,108 @@
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from constants import UP, DOWN, LEFT, RIGHT
+from game_objects import Snake, Apple
+
+Position = Tuple[int, int]
+Observation = Tuple[Position, Position, Tuple[int, int]]
+
+
+class SnakeEnv:
+    """
+    Игровая логика змейки без отрисовки и без зависимости от pygame.
+
+    Один вызов step() - один тик игры. Отрисовка и другие наблюдатели
+    подключаются как вызываемые объекты observer(env), которые вызываются
+    после reset() и после каждого тика.
+    """
+
+    ACTIONS = (UP, DOWN, LEFT, RIGHT)
+
+    def __init__(self, seed: Optional[int] = None,
+                 observers: Optional[List[Callable[["SnakeEnv"], Any]]] = None):
+        """
+        Инициализация среды.
+
+        Args:
+            seed: Зерно генератора случайных чисел для расстановки яблок.
+            observers: Наблюдатели, вызываемые после каждого тика.
+        """
+        self.rng = random.Random(seed)
+        self.observers = list(observers) if observers else []
+        self.snake = Snake()
+        self.apple = Apple()
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> Observation:
+        """
+        Начинает новую игру.
+
+        Args:
+            seed: Новое зерно генератора. Если None, генератор продолжает последовательность.
+
+        Returns:
+            Наблюдение: позиция головы, позиция яблока, направление.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.snake.reset()
+        # Направление последнего хода: при гибели Snake.move сбрасывает змейку,
+        # поэтому примененное направление сохраняется отдельно
+        self.direction = self.snake.direction
+        self.apple.randomize_position(self.snake.free_cells, self.rng)
+        self.score = 0
+        self.ticks = 0
+        self.done = False
+        self._notify()
+        return self.observe()
+
+    def observe(self) -> Observation:
+        """Возвращает наблюдение: позиция головы, позиция яблока, направление."""
+        return self.snake.positions[0], self.apple.position, self.snake.direction
+
+    def step(self, action: Optional[Tuple[int, int]] = None) -> Tuple[Observation, int, bool, Dict[str, Any]]:
+        """
+        Выполняет один тик игры.
+
+        Args:
+            action: Новое направление (UP, DOWN, LEFT, RIGHT) или None, чтобы сохранить текущее.
+
+        Returns:
+            Кортеж (наблюдение, награда, игра окончена, доп. информация).
+            Награда: 1 за яблоко, -1 за столкновение, иначе 0.
+            Доп. информация содержит примененное направление ('direction').
+        """
+        if self.done:
+            raise RuntimeError("Игра окончена, вызовите reset()")
+        snake = self.snake
+        snake.next_direction = action
+        snake.update_direction()
+        self.direction = snake.direction
+        self.ticks += 1
+
+        info: Dict[str, Any] = {'direction': snake.direction}
+        reward = 0
+        if not snake.move():
+            # Snake.move уже сбросил змейку, поэтому длину берем из счета
+            self.done = True
+            reward = -1
+            info['cause'] = 'self'
+            info['length'] = self.score + 1
+        elif snake.positions[0] == self.apple.position:
+            snake.length += 1
+            self.score += 1
+            reward = 1
+            if snake.free_cells:
+                self.apple.randomize_position(snake.free_cells, self.rng)
+            else:
+                self.done = True
+                info['cause'] = 'board_full'
+                info['length'] = snake.length
+        self._notify()
+        return self.observe(), reward, self.done, info
+
+    def _notify(self):
+        """Вызывает наблюдателей."""
+        for observer in self.observers:
+            observer(self)
@@ -0,0 +1,253 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+from array import array
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Sequence, Tuple
+
+from constants import *
+from snake_env import SnakeEnv
+from autopilot import Autopilot
+
+PERCENTILES = (50, 90, 99)
+# Поля результата одной игры в порядке кортежа, возвращаемого процессами
+FIELDS = ('seed', 'score', 'length', 'ticks', 'cause', 'timeouts')
+
+Controller = Callable[[SnakeEnv], Optional[Tuple[int, int]]]
+Result = Tuple[int, int, int, int, str, int]
+
+
+class RandomController:
+    """Случайные повороты с заданной вероятностью на каждом тике."""
+
+    def __init__(self, seed: int, turn_probability: float = 0.1):
+        """
+        Инициализация контроллера.
+
+        Args:
+            seed: Зерно собственного генератора (генератор среды не используется).
+            turn_probability: Вероятность поворота на тике.
+        """
+        self.rng = random.Random(seed)
+        self.turn_probability = turn_probability
+
+    def __call__(self, env: SnakeEnv) -> Optional[Tuple[int, int]]:
+        """Возвращает случайное направление или None."""
+        if self.rng.random() < self.turn_probability:
+            return self.rng.choice(SnakeEnv.ACTIONS)
+        return None
+
+
+class GreedyController:
+    """Ход в свободную соседнюю клетку, ближайшую к яблоку."""
+
+    def __call__(self, env: SnakeEnv) -> Optional[Tuple[int, int]]:
+        """Возвращает направление к яблоку в обход занятых клеток."""
+        snake = env.snake
+        head_x, head_y = snake.positions[0]
+        apple_x, apple_y = env.apple.position
+        best, best_distance = None, None
+        for dx, dy in SnakeEnv.ACTIONS:
+            if (-dx, -dy) == snake.direction:
+                continue
+            x = (head_x + dx * GRID_SIZE) % SCREEN_WIDTH
+            y = (head_y + dy * GRID_SIZE) % SCREEN_HEIGHT
+            if snake.occupies((x, y)):
+                continue
+            distance_x = abs(x - apple_x) // GRID_SIZE
+            distance_y = abs(y - apple_y) // GRID_SIZE
+            distance = (min(distance_x, GRID_WIDTH - distance_x)
+                        + min(distance_y, GRID_HEIGHT - distance_y))
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (dx, dy), distance
+        return best
+
+
+# Фабрики контроллеров: factory(seed, **options) -> контроллер.
+# Автопилот по умолчанию играет без бюджета времени: иначе результаты с тем же
+# зерном зависели бы от нагрузки машины и числа процессов
+CONTROLLERS: Dict[str, Callable[..., Controller]] = {
+    'autopilot': lambda seed, budget_us=None, **options: Autopilot(budget_us, **options),
+    'greedy': lambda seed, **options: GreedyController(**options),
+    'random': RandomController,
+}
+
+
+def make_controller(name: str, seed: int, options: Dict[str, Any]) -> Controller:
+    """
+    Создает контроллер для одной игры.
+
+    Args:
+        name: Имя из CONTROLLERS или путь 'модуль:фабрика' к своей фабрике
+            с сигнатурой factory(seed, **options).
+        seed: Зерно игры.
+        options: Параметры фабрики.
+    """
+    if name in CONTROLLERS:
+        factory = CONTROLLERS[name]
+    elif ':' in name:
+        module, attribute = name.split(':', 1)
+        factory = getattr(importlib.import_module(module), attribute)
+    else:
+        raise ValueError(f"Неизвестный контроллер: {name}")
+    return factory(seed, **options)
+
+
+def play_game(env: SnakeEnv, controller: Controller, seed: int, max_ticks: int) -> Result:
+    """
+    Играет одну игру до окончания или до лимита тиков.
+
+    Returns:
+        Кортеж (зерно, счет, длина, тики, причина окончания, превышения бюджета)
+        в порядке FIELDS. Причина: 'self', 'board_full' или 'max_ticks'.
+        Превышения бюджета времени берутся из атрибута timeouts контроллера
+        (0, если его нет): при них результат зависит от скорости машины.
+    """
+    env.reset(seed)
+    step = env.step
+    while env.ticks < max_ticks:
+        _, _, done, info = step(controller(env))
+        if done:
+            return (seed, env.score, info['length'], env.ticks, info['cause'],
+                    getattr(controller, 'timeouts', 0))
+    return seed, env.score, env.snake.length, env.ticks, 'max_ticks', getattr(controller, 'timeouts', 0)
+
+
+def _play_chunk(args: Tuple[str, Dict[str, Any], Sequence[int], int]) -> List[Result]:
+    """Играет игры для пачки зерен в процессе пула."""
+    name, options, seeds, max_ticks = args
+    env = SnakeEnv()
+    return [play_game(env, make_controller(name, seed, options), seed, max_ticks) for seed in seeds]
+
+
+def _percentiles(values: array) -> Dict[str, float]:
+    """Среднее и перцентили (по ближайшему рангу)."""
+    ordered = sorted(values)
+    stats = {'mean': sum(ordered) / len(ordered)}
+    for q in PERCENTILES:
+        stats[f'p{q}'] = ordered[max(0, -(-q * len(ordered) // 100) - 1)]
+    return stats
+
+
+def run_tournament(controller: str, games: int, seed: int = 0, workers: Optional[int] = None,
+                   out: Optional[IO[str]] = None, options: Optional[Dict[str, Any]] = None,
+                   max_ticks: int = 10_000, chunk_size: int = 500) -> Dict[str, Any]:
+    """
+    Играет серию игр с зернами seed, seed + 1, ... в пуле процессов.
+
+    Игры распределяются пачками по chunk_size, результаты каждой игры
+    записываются строкой JSONL по мере готовности пачек (порядок строк
+    зависит от порядка завершения, зерно записывается в каждую строку).
+
+    Args:
+        controller: Имя контроллера (см. make_controller).
+        games: Количество игр.
+        seed: Зерно первой игры.
+        workers: Количество процессов (None - по числу ядер, 1 - в текущем процессе).
+        out: Поток для результатов игр в формате JSONL.
+        options: Параметры фабрики контроллера.
+        max_ticks: Лимит тиков одной игры.
+        chunk_size: Количество игр в одной задаче пула.
+
+    Returns:
+        Сводка: количество игр, время, скорость, статистика счета, длины и тиков,
+        количество игр по причинам окончания, общее число превышений бюджета
+        времени контроллером.
+    """
+    if games <= 0 or chunk_size <= 0:
+        raise ValueError("Количество игр и размер пачки должны быть положительными")
+    options = options or {}
+    tasks = [(controller, options, range(start, min(start + chunk_size, seed + games)), max_ticks)
+             for start in range(seed, seed + games, chunk_size)]
+    columns = {field: array('q') for field in ('score', 'length', 'ticks')}
+    causes: Dict[str, int] = {}
+    timeouts = 0
+
+    started = time.perf_counter()
+    if workers == 1:
+        chunks: Iterator[List[Result]] = map(_play_chunk, tasks)
+        pool = None
+    else:
+        pool = Pool(workers)
+        chunks = pool.imap_unordered(_play_chunk, tasks)
+    try:
+        for chunk in chunks:
+            for result in chunk:
+                _, score, length, ticks, cause, game_timeouts = result
+                columns['score'].append(score)
+                columns['length'].append(length)
+                columns['ticks'].append(ticks)
+                causes[cause] = causes.get(cause, 0) + 1
+                timeouts += game_timeouts
+            if out is not None:
+                out.write(''.join(json.dumps(dict(zip(FIELDS, result)), ensure_ascii=False) + '\n'
+                                  for result in chunk))
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    elapsed = time.perf_counter() - started
+
+    summary: Dict[str, Any] = {
+        'controller': controller,
+        'games': games,
+        'workers': workers or os.cpu_count(),
+        'seconds': elapsed,
+        'games_per_second': games / elapsed,
+        'ticks_per_second': sum(columns['ticks']) / elapsed,
+        'causes': causes,
+        'timeouts': timeouts,
+    }
+    for field, values in columns.items():
+        summary[field] = _percentiles(values)
+    return summary
+
+
+def print_summary(summary: Dict[str, Any]):
+    """Выводит сводку турнира."""
+    print(f"{summary['controller']}: {summary['games']} игр за {summary['seconds']:.1f} с "
+          f"({summary['workers']} процессов, {summary['games_per_second']:.0f} игр/с, "
+          f"{summary['ticks_per_second']:.0f} тиков/с)")
+    for field in ('score', 'length', 'ticks'):
+        stats = summary[field]
+        print(f"  {field:<7} среднее {stats['mean']:8.1f}  "
+              + '  '.join(f"p{q} {stats[f'p{q}']:6d}" for q in PERCENTILES))
+    print('  окончание: ' + ', '.join(f"{cause} {count}" for cause, count in sorted(summary['causes'].items())))
+    if summary['timeouts']:
+        print(f"  превышений бюджета времени: {summary['timeouts']} (результаты зависят от скорости машины)")
+
+
+def _parse_option(text: str) -> Tuple[str, Any]:
+    """Разбирает параметр контроллера вида имя=значение (значение в формате JSON или строка)."""
+    name, _, value = text.partition('=')
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Турнир контроллеров змейки')
+    parser.add_argument('controller', help="имя контроллера (autopilot, greedy, random) или 'модуль:фабрика'")
+    parser.add_argument('--games', type=int, default=10_000, help='количество игр')
+    parser.add_argument('--seed', type=int, default=0, help='зерно первой игры')
+    parser.add_argument('--workers', type=int, default=None, help='количество процессов')
+    parser.add_argument('--out', metavar='JSONL', help='файл для результатов игр')
+    parser.add_argument('--max-ticks', type=int, default=10_000, help='лимит тиков одной игры')
+    parser.add_argument('--chunk-size', type=int, default=500, help='игр в одной задаче пула')
+    parser.add_argument('--option', action='append', default=[], metavar='ИМЯ=ЗНАЧЕНИЕ',
+                        help='параметр фабрики контроллера (можно повторять)')
+    args = parser.parse_args()
+
+    options = dict(_parse_option(option) for option in args.option)
+    out = open(args.out, 'w', encoding='utf-8') if args.out else None
+    try:
+        summary = run_tournament(args.controller, args.games, args.seed, args.workers, out,
+                                 options, args.max_ticks, args.chunk_size)
+    finally:
+        if out is not None:
+            out.close()
+    print_summary(summary)
@@ -1,19 +1,28 @@
 import pygame
+from typing import List, Tuple
 from game_objects import Snake
 from constants import *
 
-def handle_keys(snake: Snake):
-    """Обрабатывает нажатия клавиш для управления змейкой."""
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+}
+
+def poll_directions() -> List[Tuple[int, int]]:
+    """Обрабатывает события и возвращает все нажатые направления в порядке нажатия."""
+    directions = []
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             pygame.quit()
             raise SystemExit
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP:
-                snake.next_direction = UP
-            elif event.key == pygame.K_DOWN:
-                snake.next_direction = DOWN
-            elif event.key == pygame.K_LEFT:
-                snake.next_direction = LEFT
-            elif event.key == pygame.K_RIGHT:
-                snake.next_direction = RIGHT
\ No newline at end of file
+        elif event.type == pygame.KEYDOWN and event.key in KEY_DIRECTIONS:
+            directions.append(KEY_DIRECTIONS[event.key])
+    return directions
+
+def handle_keys(snake: Snake):
+    """Обрабатывает нажатия клавиш для управления змейкой."""
+    directions = poll_directions()
+    if directions:
+        snake.next_direction = directions[-1]
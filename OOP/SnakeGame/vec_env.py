@@ -0,0 +1,156 @@
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from constants import GRID_WIDTH, GRID_HEIGHT
+from snake_env import SnakeEnv
+
+# Смещения (dx, dy) в порядке SnakeEnv.ACTIONS и индекс противоположного направления
+_DX = np.array([dx for dx, _ in SnakeEnv.ACTIONS], dtype=np.int32)
+_DY = np.array([dy for _, dy in SnakeEnv.ACTIONS], dtype=np.int32)
+_OPPOSITE = np.array([SnakeEnv.ACTIONS.index((-dx, -dy)) for dx, dy in SnakeEnv.ACTIONS])
+_RIGHT = SnakeEnv.ACTIONS.index((1, 0))
+NO_ACTION = -1
+
+
+class VecSnakeEnv:
+    """
+    Пакетная среда: num_envs независимых игр змейки на массивах NumPy.
+
+    Правила совпадают со Snake/Apple/SnakeEnv: поле с переходом через края,
+    разворот в обратную сторону игнорируется, столкновение проверяется до
+    освобождения хвоста, яблоко появляется на случайной свободной клетке.
+    Клетка задается индексом y * GRID_WIDTH + x. Тело каждой змейки хранится
+    в кольцевом буфере, занятость клеток - в булевой матрице поля.
+    Закончившиеся игры сразу начинаются заново.
+    """
+
+    def __init__(self, num_envs: int, seed: Optional[int] = None,
+                 width: int = GRID_WIDTH, height: int = GRID_HEIGHT):
+        """
+        Инициализация пакета игр.
+
+        Args:
+            num_envs: Количество одновременных игр.
+            seed: Зерно генератора случайных чисел.
+            width: Ширина поля в клетках.
+            height: Высота поля в клетках.
+        """
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.rng = np.random.default_rng(seed)
+        self._rows = np.arange(num_envs)
+
+        self.board = np.zeros((num_envs, self.cells), dtype=bool)
+        self.body = np.zeros((num_envs, self.cells), dtype=np.int32)
+        self.head_ptr = np.zeros(num_envs, dtype=np.int64)
+        self.size = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int64)
+        self.apple = np.zeros(num_envs, dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.reset()
+
+    @property
+    def heads(self) -> np.ndarray:
+        """Индексы клеток голов."""
+        return self.body[self._rows, self.head_ptr]
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Начинает игры заново.
+
+        Args:
+            mask: Булев массив игр для сброса. Если None, сбрасываются все.
+
+        Returns:
+            Наблюдение (головы, яблоки, направления).
+        """
+        idx = self._rows if mask is None else np.flatnonzero(mask)
+        if len(idx):
+            # Начальная позиция - центр поля (для стандартного поля совпадает со Snake.reset)
+            start = (self.height // 2) * self.width + self.width // 2
+            self.board[idx] = False
+            self.board[idx, start] = True
+            self.head_ptr[idx] = 0
+            self.body[idx, 0] = start
+            self.size[idx] = 1
+            self.length[idx] = 1
+            self.direction[idx] = _RIGHT
+            self.score[idx] = 0
+            self.ticks[idx] = 0
+            self.apple[idx] = self._sample_free(idx)
+        return self.observe()
+
+    def observe(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Возвращает наблюдение: индексы голов, индексы яблок, индексы направлений."""
+        return self.heads, self.apple.copy(), self.direction.copy()
+
+    def _sample_free(self, idx: np.ndarray) -> np.ndarray:
+        """Равновероятный выбор свободной клетки для каждой игры из idx (-1 при полном поле)."""
+        keys = self.rng.random((len(idx), self.cells))
+        keys[self.board[idx]] = -1.0
+        cells = keys.argmax(axis=1)
+        cells[keys[np.arange(len(idx)), cells] < 0] = -1
+        return cells
+
+    def step(self, actions: np.ndarray) -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray],
+                                                  np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Выполняет один тик во всех играх.
+
+        Args:
+            actions: Массив индексов направлений SnakeEnv.ACTIONS (NO_ACTION - без изменения).
+
+        Returns:
+            Кортеж (наблюдение, награды, признаки окончания, доп. информация).
+            В доп. информации 'length' - длина змейки в закончившихся играх
+            и 'board_full' - игры, закончившиеся заполнением поля.
+        """
+        actions = np.asarray(actions)
+        rows = self._rows
+        turn = (actions >= 0) & (actions != _OPPOSITE[self.direction])
+        self.direction = np.where(turn, actions, self.direction)
+        self.ticks += 1
+
+        head = self.body[rows, self.head_ptr]
+        x = (head % self.width + _DX[self.direction]) % self.width
+        y = (head // self.width + _DY[self.direction]) % self.height
+        new_head = y * self.width + x
+
+        # Столкновение проверяется до освобождения хвоста, как в Snake.move
+        dead = self.board[rows, new_head]
+        alive = np.flatnonzero(~dead)
+        new_head = new_head[alive]
+
+        ptr = (self.head_ptr[alive] + 1) % self.cells
+        self.head_ptr[alive] = ptr
+        self.body[alive, ptr] = new_head
+        self.board[alive, new_head] = True
+        self.size[alive] += 1
+
+        shrink = alive[self.size[alive] > self.length[alive]]
+        tail_ptr = (self.head_ptr[shrink] - self.size[shrink] + 1) % self.cells
+        self.board[shrink, self.body[shrink, tail_ptr]] = False
+        self.size[shrink] -= 1
+
+        rewards = np.zeros(self.num_envs, dtype=np.int64)
+        rewards[dead] = -1
+        eaters = alive[new_head == self.apple[alive]]
+        self.length[eaters] += 1
+        self.score[eaters] += 1
+        rewards[eaters] = 1
+        board_full = np.zeros(self.num_envs, dtype=bool)
+        if len(eaters):
+            apples = self._sample_free(eaters)
+            self.apple[eaters] = apples
+            board_full[eaters[apples < 0]] = True
+
+        dones = dead | board_full
+        lengths = np.where(dead, self.score + 1, np.where(board_full, self.length, 0))
+        if dones.any():
+            self.reset(dones)
+        return self.observe(), rewards, dones, {'length': lengths, 'board_full': board_full}
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Union
+from itertools import islice, product
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
 class Roman:
     """
@@ -21,6 +23,23 @@ class Roman:
         (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')
     ]
 
+    # Наибольшее число, записываемое в канонической форме
+    MAX_VALUE = 3999
+
+    # Записи цифр разрядов: единицы, десятки, сотни, тысячи (индекс - цифра)
+    _DIGITS = (
+        ('', 'I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX'),
+        ('', 'X', 'XX', 'XXX', 'XL', 'L', 'LX', 'LXX', 'LXXX', 'XC'),
+        ('', 'C', 'CC', 'CCC', 'CD', 'D', 'DC', 'DCC', 'DCCC', 'CM'),
+        ('', 'M', 'MM', 'MMM'),
+    )
+
+    # Таблицы для чисел 1..MAX_VALUE, строятся один раз при импорте:
+    # число -> римская запись (перебор цифр от тысяч к единицам дает числа
+    # 0..3999 по порядку, индекс 0 не используется) и запись -> число
+    _TO_ROMAN = [''.join(digits) for digits in product(*reversed(_DIGITS))]
+    _FROM_ROMAN = {roman: n for n, roman in enumerate(_TO_ROMAN) if n}
+
     def __init__(self, value: Union[str, int]):
         """
         Инициализация экземпляра класса Roman.
@@ -33,6 +52,8 @@ class Roman:
             self._value = value
         else:
             raise ValueError("Недопустимый тип данных для инициализации.")
+        # Римская запись вычисляется при первом обращении и запоминается
+        self._roman = None
 
     @property
     def value(self) -> int:
@@ -50,16 +71,118 @@ class Roman:
         - roman: строка, представляющая римское число.
         Результат: целое число.
         """
-        total = 0
-        prev_value = 0
-        for char in reversed(roman):
-            value = Roman._ROMAN_TO_ARABIC[char]
-            if value < prev_value:
-                total -= value
+        # Каноническая запись 1..3999 - поиск в таблице
+        value = Roman._FROM_ROMAN.get(roman)
+        if value is not None:
+            return value
+        # Числа больше 3999 записываются лишними M перед канонической записью остатка
+        rest = roman.lstrip('M')
+        thousands = len(roman) - len(rest)
+        if thousands > 3 and (not rest or rest in Roman._FROM_ROMAN):
+            return thousands * 1000 + Roman._FROM_ROMAN.get(rest, 0)
+        raise ValueError(Roman._format_error(roman))
+
+    @staticmethod
+    def _format_error(roman: str) -> str:
+        """
+        Формирует сообщение об ошибке для некорректной римской записи.
+        Параметры:
+        - roman: строка, не являющаяся канонической римской записью.
+        Результат: текст ошибки.
+        """
+        if not roman:
+            return "Пустая строка вместо римского числа."
+        invalid = sorted(set(roman) - set(Roman._ROMAN_TO_ARABIC))
+        if invalid:
+            return f"Недопустимые символы {''.join(invalid)!r} в римском числе {roman!r}."
+        return f"Неканоническая запись римского числа: {roman!r}."
+
+    @staticmethod
+    def _convert_line(line: str, to_roman: bool) -> Tuple[Union[int, str, None], Optional[str]]:
+        """
+        Строго преобразует одну строку (пробелы по краям отбрасываются).
+        Параметры:
+        - line: римское число или, при to_roman, десятичное число.
+        - to_roman: направление преобразования (True - из арабского в римское).
+        Результат: пара (результат, None) или (None, текст ошибки).
+        """
+        text = line.strip()
+        if to_roman:
+            if not (text.isascii() and text.isdigit()):
+                return None, f"Не целое положительное число: {text!r}."
+            number = int(text)
+            if not 1 <= number <= Roman.MAX_VALUE:
+                return None, f"Число {number} вне диапазона 1..{Roman.MAX_VALUE}."
+            return Roman._TO_ROMAN[number], None
+        value = Roman._FROM_ROMAN.get(text)
+        if value is not None:
+            return value, None
+        # Запись, которую принимает Roman (лишние M), - это число вне диапазона,
+        # а не ошибка записи: сообщение то же, что и при to_roman
+        try:
+            value = Roman._roman_to_arabic(text)
+        except ValueError as error:
+            return None, str(error)
+        return None, f"Число {value} ({text}) вне диапазона 1..{Roman.MAX_VALUE}."
+
+    @staticmethod
+    def convert_many(lines: Iterable[Union[str, int]], to_roman: bool = False
+                     ) -> Iterator[Tuple[int, Union[int, str, None], Optional[str]]]:
+        """
+        Потоковое преобразование последовательности строк (например, открытого файла).
+        Принимаются только канонические записи 1..3999 (проверка по таблице);
+        записи больше 3999, допустимые для Roman, сообщаются как выход за диапазон,
+        ошибка в строке не прерывает обработку остальных.
+        Параметры:
+        - lines: строки с римскими числами или, при to_roman, с арабскими (допускаются int).
+        - to_roman: направление преобразования (True - из арабского в римское).
+        Результат: генератор троек (номер строки с 1, результат или None, текст ошибки или None).
+        """
+        for number, line in enumerate(lines, 1):
+            result, error = Roman._convert_line(str(line), to_roman)
+            yield number, result, error
+
+    @staticmethod
+    def convert_file(source: str, target: str, to_roman: bool = False, workers: int = 1,
+                     chunk_size: int = 100_000) -> List[Tuple[int, str]]:
+        """
+        Преобразует файл построчно, результат пишется в target строка в строку
+        (на месте ошибочной строки - пустая строка).
+        Параметры:
+        - source: путь к исходному файлу.
+        - target: путь к файлу результата.
+        - to_roman: направление преобразования (True - из арабского в римское).
+        - workers: количество процессов (1 - в текущем процессе).
+        - chunk_size: количество строк в одной задаче процесса.
+        Результат: список ошибок (номер строки, текст ошибки).
+        """
+        errors = []
+        with open(source, encoding='utf-8') as src, open(target, 'w', encoding='utf-8') as dst:
+            chunks = iter(lambda: list(islice(src, chunk_size)), [])
+            tasks = ((chunk, to_roman) for chunk in chunks)
+            if workers == 1:
+                results = map(_convert_chunk, tasks)
+                pool = None
             else:
-                total += value
-            prev_value = value
-        return total
+                pool = Pool(workers)
+                results = pool.imap(_convert_chunk, tasks)
+            try:
+                number = 0
+                for chunk in results:
+                    lines = []
+                    for result, error in chunk:
+                        number += 1
+                        if error is None:
+                            lines.append(f"{result}\n")
+                        else:
+                            errors.append((number, error))
+                            lines.append("\n")
+                    dst.writelines(lines)
+            finally:
+                if pool is not None:
+                    pool.terminate()
+                    pool.join()
+        return errors
 
     @staticmethod
     def _arabic_to_roman(arabic: int) -> str:
@@ -71,6 +194,8 @@ class Roman:
         """
         if arabic <= 0:
             raise ValueError("Римские числа могут быть только положительными.")
+        if arabic <= Roman.MAX_VALUE:
+            return Roman._TO_ROMAN[arabic]
         result = []
         for num, symbol in Roman._ARABIC_TO_ROMAN:
             while arabic >= num:
@@ -119,14 +244,27 @@ class Roman:
         Вызываемый метод для получения римского числа.
         Результат: строка, представляющая римское число.
         """
-        return self._arabic_to_roman(self._value)
+        return str(self)
 
     def __str__(self) -> str:
         """
         Возвращает строковое представление римского числа.
         Результат: строка.
         """
-        return self._arabic_to_roman(self._value)
+        if self._roman is None:
+            self._roman = self._arabic_to_roman(self._value)
+        return self._roman
+
+def _convert_chunk(task: Tuple[List[str], bool]) -> List[Tuple[Union[int, str, None], Optional[str]]]:
+    """
+    Преобразует пачку строк (выполняется в процессе пула).
+    Параметры:
+    - task: пара (строки, направление преобразования).
+    Результат: список пар (результат, текст ошибки).
+    """
+    lines, to_roman = task
+    convert = Roman._convert_line
+    return [convert(line, to_roman) for line in lines]
 
 # Пример использования
 if __name__ == "__main__":
@@ -146,4 +284,7 @@ if __name__ == "__main__":
     print(f"r1 * r2: {r5()}")  # r1 * r2: L
 
     r6 = r1 / r2
-    print(f"r1 / r2: {r6()}")  # r1 / r2: II
\ No newline at end of file
+    print(f"r1 / r2: {r6()}")  # r1 / r2: II
+
+    for number, result, error in Roman.convert_many(["XIV", "IIII", "VX", "MMXXIV", "A1"]):
+        print(f"{number}: {result if error is None else error}")
\ No newline at end of file
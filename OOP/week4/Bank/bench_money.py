@@ -0,0 +1,66 @@
+import random
+import time
+from decimal import Decimal, ROUND_HALF_EVEN as DECIMAL_HALF_EVEN
+
+from deposit import BankDeposit, DepositRecommender, BonusDeposit, CompoundDeposit
+from money import FixedPointDeposit
+
+KOPECK = Decimal('0.01')
+
+
+def decimal_profit(deposit: BankDeposit, amount: Decimal) -> Decimal:
+    """
+    Расчет прибыли в Decimal по тем же формулам, что и calculate_profit.
+    Параметры:
+        deposit: Экземпляр класса вклада
+        amount: Сумма вклада
+    Результат:
+        Прибыль, округленная до копейки
+    """
+    rate = Decimal(repr(deposit.rate))
+    if isinstance(deposit, CompoundDeposit):
+        profit = amount * (1 + rate / 12) ** deposit.period - amount
+    else:
+        profit = amount * rate * deposit.period / 12
+        if isinstance(deposit, BonusDeposit) and amount >= Decimal(repr(deposit.bonus_threshold)):
+            profit += profit * Decimal(repr(deposit.bonus_rate))
+    return profit.quantize(KOPECK, rounding=DECIMAL_HALF_EVEN)
+
+
+def measure(name: str, func, repeat: int = 3) -> float:
+    """Лучшее время из нескольких запусков"""
+    best = min(_timed(func) for _ in range(repeat))
+    print(f"{name:<14}{best:8.3f} с")
+    return best
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(count: int = 200_000):
+    """Сравнение float, Decimal и расчета в целых копейках"""
+    random.seed(0)
+    kopecks = [random.randint(50_000_00, 1_000_000_00) for _ in range(count)]
+    floats = [k / 100 for k in kopecks]
+    decimals = [Decimal(k) / 100 for k in kopecks]
+
+    for deposit in DepositRecommender().deposits:
+        fixed = FixedPointDeposit(deposit)
+        print(f"\n{deposit}, {count} сумм:")
+        measure("float", lambda: [deposit.calculate_profit(a) for a in floats])
+        measure("Decimal", lambda: [decimal_profit(deposit, a) for a in decimals])
+        measure("копейки", lambda: fixed.profit_many(kopecks))
+
+        # Точный расчет должен совпадать с Decimal до копейки
+        mismatches = sum(
+            fixed.profit(k) != int(decimal_profit(deposit, d) * 100)
+            for k, d in zip(kopecks[:1000], decimals[:1000])
+        )
+        print(f"Расхождений с Decimal на 1000 сумм: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import cProfile
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from deposit import BankDeposit, TermDeposit, BonusDeposit, CompoundDeposit, DepositRecommender
+
+CATALOGUE_SIZES = (3, 1_000, 100_000)
+PERIODS = (3, 6, 12, 24, 36)
+# Реальные каталоги используют круглые суммы, поэтому число различных
+# минимальных сумм и порогов бонуса ограничено
+MIN_AMOUNTS = tuple(range(10_000, 210_000, 10_000))
+BONUS_THRESHOLDS = tuple(range(100_000, 1_100_000, 100_000))
+# Размеры каталогов с некруглыми суммами (до копеек): почти все границы
+# интервалов различны, что нагружает таблицу ранжирования
+UNEVEN_SIZES = (1_000, 100_000)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+
+def make_catalogue(size: int, rng: random.Random, uneven: bool = False) -> List[BankDeposit]:
+    """
+    Генерация каталога вкладов.
+    Параметры:
+        size: Количество вкладов (3 - базовый набор DepositRecommender)
+        rng: Генератор случайных чисел
+        uneven: Некруглые минимальные суммы и пороги бонуса (до копеек)
+    Результат:
+        Список вкладов
+    """
+    if size == 3:
+        return list(DepositRecommender().deposits)
+    deposits = []
+    for i in range(size):
+        if uneven:
+            min_amount = rng.randint(1_000_000, 20_000_000) / 100
+            threshold = rng.randint(10_000_000, 100_000_000) / 100
+        else:
+            min_amount = rng.choice(MIN_AMOUNTS)
+            threshold = rng.choice(BONUS_THRESHOLDS)
+        args = (f"Вклад {i}", min_amount, rng.randint(10, 120) / 1000, rng.choice(PERIODS))
+        kind = rng.randrange(3)
+        if kind == 0:
+            deposits.append(TermDeposit(*args))
+        elif kind == 1:
+            deposits.append(BonusDeposit(*args, threshold, rng.randint(5, 50) / 100))
+        else:
+            deposits.append(CompoundDeposit(*args))
+    return deposits
+
+
+def make_queries(count: int, rng: random.Random) -> List[Tuple[float, int]]:
+    """Генерация запросов (сумма, срок)"""
+    return [(rng.randint(1, 1_000) * 1_000.0, rng.choice(PERIODS)) for _ in range(count)]
+
+
+def measure(func: Callable[[float, int], object], queries: List[Tuple[float, int]],
+            max_seconds: float) -> Dict[str, float]:
+    """
+    Замер скорости обработки запросов.
+    Описание: Запросы обрабатываются по порядку, пока не закончатся
+              или не истечет лимит времени.
+    Параметры:
+        func: Функция (сумма, срок)
+        queries: Запросы
+        max_seconds: Лимит времени на замер
+    Результат:
+        Словарь с количеством операций, временем и скоростью
+    """
+    done = 0
+    clock = time.perf_counter
+    started = clock()
+    deadline = started + max_seconds
+    # Время проверяется пачками, чтобы не искажать замер
+    for start in range(0, len(queries), 1_000):
+        for amount, period in queries[start:start + 1_000]:
+            func(amount, period)
+        done = min(start + 1_000, len(queries))
+        if clock() > deadline:
+            break
+    elapsed = clock() - started
+    return {'ops': done, 'seconds': elapsed, 'ops_per_sec': done / elapsed,
+            'mean_us': elapsed / done * 1e6}
+
+
+def run(queries: int, max_seconds: float, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Запуск всех замеров.
+    Параметры:
+        queries: Количество запросов на замер
+        max_seconds: Лимит времени на один замер
+        seed: Зерно генератора
+    Результат:
+        Словарь: название замера -> результат measure
+    """
+    rng = random.Random(seed)
+    query_list = make_queries(queries, rng)
+    results = {}
+
+    for deposit in DepositRecommender().deposits:
+        # Суммы не ниже минимальной, чтобы замерять расчет, а не исключение
+        calc = deposit.calculate_profit
+        results[f"calculate_profit/{type(deposit).__name__}"] = measure(
+            lambda amount, _: calc(amount + deposit.min_amount), query_list, max_seconds)
+
+    cases = [(str(size), size, False) for size in CATALOGUE_SIZES]
+    cases += [(f"{size}-uneven", size, True) for size in UNEVEN_SIZES]
+    for case, size, uneven in cases:
+        started = time.perf_counter()
+        recommender = DepositRecommender(cache_size=0, deposits=make_catalogue(size, rng, uneven))
+        build = time.perf_counter() - started
+        results[f"build/{case}"] = {'ops': size, 'seconds': build, 'ops_per_sec': size / build,
+                                    'mean_us': build / size * 1e6}
+        results[f"recommend/{case}"] = measure(recommender.recommend, query_list, max_seconds)
+        results[f"recommend_top3/{case}"] = measure(
+            lambda amount, period: recommender.recommend_top(amount, period, 3),
+            query_list, max_seconds)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """
+    Сравнение с базовыми результатами.
+    Параметры:
+        results: Текущие результаты
+        baseline: Базовые результаты
+        tolerance: Допустимое относительное снижение скорости
+    Результат:
+        Список описаний регрессий
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = current['ops_per_sec'] / base['ops_per_sec']
+        mark = ''
+        if ratio < 1 - tolerance:
+            mark = '  <-- регрессия'
+            regressions.append(f"{name}: {ratio:.2f}x от базового")
+        print(f"{name:<36}{current['ops_per_sec']:>14.0f} оп/с  {ratio:6.2f}x{mark}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа: замер, сохранение JSON и сравнение с базовыми результатами"""
+    parser = argparse.ArgumentParser(description="Замеры производительности подбора вкладов")
+    parser.add_argument('--queries', type=int, default=1_000_000, help="запросов на замер")
+    parser.add_argument('--max-seconds', type=float, default=10.0, help="лимит времени на замер")
+    parser.add_argument('--output', default='bench_results.json', help="файл результатов")
+    parser.add_argument('--baseline', help="файл базовых результатов; если задан, "
+                        "его отсутствие считается ошибкой (по умолчанию bench_baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="сохранить результаты как базовые")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="допустимое снижение скорости")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="сохранить профиль cProfile (для flamegraph: flameprof, snakeviz)")
+    args = parser.parse_args(argv)
+    # Явно запрошенное сравнение не должно молча пропускаться
+    required = args.baseline is not None
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if required and not args.save_baseline and not args.profile and not os.path.exists(baseline_path):
+        print(f"Базовые результаты не найдены: {baseline_path}")
+        return 2
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        results = profiler.runcall(run, args.queries, args.max_seconds)
+        profiler.dump_stats(args.profile)
+    else:
+        results = run(args.queries, args.max_seconds)
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(),
+              'results': results}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.profile:
+        # Накладные расходы профилировщика делают сравнение бессмысленным
+        print(f"Профиль сохранен в {args.profile}, сравнение с базовыми результатами пропущено")
+        return 0
+    if args.save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Базовые результаты сохранены в {baseline_path}")
+        return 0
+    if not os.path.exists(baseline_path):
+        for name, current in results.items():
+            print(f"{name:<36}{current['ops_per_sec']:>14.0f} оп/с")
+        print("Базовые результаты не найдены, сравнение пропущено "
+              "(сохраните их с --save-baseline или укажите --baseline)")
+        return 0
+
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("Обнаружены регрессии:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import csv
+import json
+import os
+import pickle
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from deposit import BankDeposit, TermDeposit, BonusDeposit, CompoundDeposit, DepositRecommender
+
+# Тип вклада в файле каталога -> класс и поля конструктора с преобразованием типов
+DEPOSIT_TYPES = {
+    'term': TermDeposit,
+    'bonus': BonusDeposit,
+    'compound': CompoundDeposit,
+}
+
+_BASE_FIELDS = (('name', str), ('min_amount', float), ('rate', float), ('period', int))
+_FIELDS = {
+    'term': _BASE_FIELDS,
+    'bonus': _BASE_FIELDS + (('bonus_threshold', float), ('bonus_rate', float)),
+    'compound': _BASE_FIELDS,
+}
+
+_CACHE_VERSION = 1
+
+
+def _spec_from_record(record: Dict[str, Any]) -> Tuple[type, tuple]:
+    """
+    Преобразование записи каталога в класс вклада и аргументы конструктора.
+    Параметры:
+        record: Словарь полей вклада, поле type - тип вклада
+    Результат:
+        Пара (класс вклада, аргументы конструктора)
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Запись должна быть объектом с полями вклада")
+    kind = record.get('type')
+    if kind not in DEPOSIT_TYPES:
+        raise ValueError(f"Неизвестный тип вклада: {kind}")
+    args = []
+    for field, convert in _FIELDS[kind]:
+        # В короткой строке CSV недостающие поля равны None
+        value = record.get(field)
+        if value is None:
+            raise ValueError(f"Не указано поле {field}")
+        try:
+            args.append(convert(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"Некорректное значение поля {field}: {value!r}") from None
+    return DEPOSIT_TYPES[kind], tuple(args)
+
+
+def parse_catalog(path: str) -> Iterator[Tuple[type, tuple]]:
+    """
+    Чтение каталога вкладов из файла JSON Lines (.jsonl) или CSV (.csv).
+    Параметры:
+        path: Путь к файлу каталога
+    Результат:
+        Генератор пар (класс вклада, аргументы конструктора)
+    """
+    _, ext = os.path.splitext(path)
+    with open(path, encoding='utf-8', newline='') as f:
+        if ext == '.csv':
+            # Первая строка - заголовок, строка данных начинается со второй
+            records = enumerate(csv.DictReader(f), 2)
+            decode = None
+        elif ext == '.jsonl':
+            records = ((n, line) for n, line in enumerate(f, 1) if line.strip())
+            decode = json.loads
+        else:
+            raise ValueError(f"Неподдерживаемый формат каталога: {ext}")
+        for line_no, record in records:
+            # Строка JSON разбирается здесь, чтобы ее ошибка тоже указывала номер строки
+            try:
+                if decode is not None:
+                    record = decode(record)
+                yield _spec_from_record(record)
+            except ValueError as e:
+                raise ValueError(f"{path}, строка {line_no}: {e}") from None
+
+
+def _source_stamp(path: str) -> Tuple[str, int, int]:
+    """Отпечаток исходного файла для проверки актуальности кэша"""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def _read_cache(cache_path: str, stamp: Tuple[str, int, int]) -> Optional[list]:
+    """Чтение разобранного каталога из кэша, None если кэш отсутствует или устарел"""
+    try:
+        with open(cache_path, 'rb') as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if data.get('version') != _CACHE_VERSION or data.get('source') != stamp:
+        return None
+    return data['specs']
+
+
+def _write_cache(cache_path: str, stamp: Tuple[str, int, int], specs: list) -> None:
+    """Атомарная запись разобранного каталога в кэш"""
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': _CACHE_VERSION, 'source': stamp, 'specs': specs},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def load_catalog(path: str, recommender: Optional[DepositRecommender] = None,
+                 cache_path: Optional[str] = None) -> DepositRecommender:
+    """
+    Загрузка каталога вкладов в рекомендатель.
+    Описание: Вклады добавляются отложенно: объекты и индексы для срока
+              создаются при первом запросе на этот срок. Если указан файл кэша,
+              разобранный каталог сохраняется в него, и повторный запуск
+              с неизмененным исходным файлом пропускает разбор.
+    Параметры:
+        path: Путь к файлу каталога (.jsonl или .csv)
+        recommender: Рекомендатель для пополнения (по умолчанию - новый, без базового набора)
+        cache_path: Путь к файлу кэша (None - без кэша)
+    Результат:
+        Рекомендатель с загруженным каталогом
+    """
+    if recommender is None:
+        recommender = DepositRecommender(deposits=())
+
+    specs = None
+    if cache_path is not None:
+        stamp = _source_stamp(path)
+        specs = _read_cache(cache_path, stamp)
+    if specs is None:
+        specs = list(parse_catalog(path))
+        if cache_path is not None:
+            _write_cache(cache_path, stamp, specs)
+
+    recommender.add_deposits_lazy(specs)
+    return recommender
+
+
+def save_catalog(deposits: Iterator[BankDeposit], path: str) -> None:
+    """
+    Сохранение вкладов в файл каталога JSON Lines.
+    Параметры:
+        deposits: Вклады для сохранения
+        path: Путь к файлу каталога
+    """
+    types = {cls: kind for kind, cls in DEPOSIT_TYPES.items()}
+    with open(path, 'w', encoding='utf-8') as f:
+        for deposit in deposits:
+            kind = types[type(deposit)]
+            record = {'type': kind}
+            record.update((field, getattr(deposit, field)) for field, _ in _FIELDS[kind])
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
@@ -1,5 +1,18 @@
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Union
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, deque
+from heapq import heapify, heappop, merge
+from itertools import islice
+from math import isqrt
+from multiprocessing import Pool
+from multiprocessing.pool import AsyncResult
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Union, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy нужен только для пакетных расчетов
+    np = None
 
 class BankDeposit(ABC):
     """
@@ -32,6 +45,50 @@ class BankDeposit(ABC):
         """
         pass
     
+    def _profit_array(self, amounts: "np.ndarray") -> "np.ndarray":
+        """
+        Векторный расчет прибыли.
+        Описание: По умолчанию calculate_profit вызывается для каждой суммы
+                  не меньше минимальной, для остальных сумм прибыль равна 0
+                  (они маскируются в calculate_profit_many).
+        Параметры:
+            amounts: Массив сумм вклада
+        Результат:
+            Массив размеров прибыли
+        """
+        profit = np.zeros(amounts.shape)
+        eligible = amounts >= self.min_amount
+        profit[eligible] = [self.calculate_profit(float(amount)) for amount in amounts[eligible]]
+        return profit
+    
+    def _profit_segments(self, num: Callable[[float], Any] = float) -> Optional[List[Tuple[Any, Any]]]:
+        """
+        Описание прибыли как кусочно-линейной функции суммы.
+        Параметры:
+            num: Тип чисел для расчета (float или точное преобразование, например в Fraction)
+        Результат:
+            Список пар (начальная сумма участка, прибыль на 1 ₽ вклада),
+            упорядоченный по начальной сумме, или None, если описания нет
+            (такие вклады подбираются перебором через calculate_profit)
+        """
+        return None
+    
+    def calculate_profit_many(self, amounts: Union[Sequence[float], "np.ndarray"]) -> "np.ma.MaskedArray":
+        """
+        Расчет прибыли сразу для массива сумм.
+        Описание: Вместо исключения для сумм меньше минимальной
+                  соответствующие элементы результата маскируются.
+        Параметры:
+            amounts: Последовательность или массив сумм вклада
+        Результат:
+            Маскированный массив прибыли (маска - сумма не подходит под вклад)
+        """
+        if np is None:
+            raise ImportError("Для пакетного расчета требуется NumPy")
+        amounts = np.asarray(amounts, dtype=np.float64)
+        return np.ma.masked_array(self._profit_array(amounts),
+                                  mask=amounts < self.min_amount)
+    
     def __call__(self, amount: float) -> float:
         """
         Вызываемый метод для расчета прибыли.
@@ -64,6 +121,14 @@ class TermDeposit(BankDeposit):
         if amount < self.min_amount:
             raise ValueError(f"Минимальная сумма вклада {self.min_amount:.2f} ₽")
         return amount * self.rate * (self.period / 12)
+    
+    def _profit_array(self, amounts: "np.ndarray") -> "np.ndarray":
+        """Векторный расчет простых процентов"""
+        return amounts * (self.rate * (self.period / 12))
+    
+    def _profit_segments(self, num: Callable[[float], Any] = float) -> List[Tuple[Any, Any]]:
+        """Простые проценты линейны по сумме на всем допустимом диапазоне"""
+        return [(num(self.min_amount), num(self.rate) * (num(self.period) / 12))]
 
 class BonusDeposit(BankDeposit):
     """
@@ -100,6 +165,20 @@ class BonusDeposit(BankDeposit):
             bonus = base_profit * self.bonus_rate
             return base_profit + bonus
         return base_profit
+    
+    def _profit_array(self, amounts: "np.ndarray") -> "np.ndarray":
+        """Векторный расчет прибыли с бонусом для сумм не ниже порога"""
+        base_profit = amounts * (self.rate * (self.period / 12))
+        return np.where(amounts >= self.bonus_threshold,
+                        base_profit * (1 + self.bonus_rate), base_profit)
+    
+    def _profit_segments(self, num: Callable[[float], Any] = float) -> List[Tuple[Any, Any]]:
+        """Бонус меняет коэффициент прибыли начиная с порога"""
+        base = num(self.rate) * (num(self.period) / 12)
+        bonus = base * (1 + num(self.bonus_rate))
+        if self.bonus_threshold <= self.min_amount:
+            return [(num(self.min_amount), bonus)]
+        return [(num(self.min_amount), base), (num(self.bonus_threshold), bonus)]
 
 class CompoundDeposit(BankDeposit):
     """
@@ -121,20 +200,284 @@ class CompoundDeposit(BankDeposit):
         monthly_rate = self.rate / 12
         total_amount = amount * (1 + monthly_rate) ** self.period
         return total_amount - amount
+    
+    def _profit_array(self, amounts: "np.ndarray") -> "np.ndarray":
+        """Векторный расчет сложных процентов"""
+        return amounts * ((1 + self.rate / 12) ** self.period - 1)
+    
+    def _profit_segments(self, num: Callable[[float], Any] = float) -> List[Tuple[Any, Any]]:
+        """Множитель капитализации постоянен для вклада"""
+        return [(num(self.min_amount), (1 + num(self.rate) / 12) ** self.period - 1)]
+
+# Запись таблицы ранжирования: (-коэффициент прибыли, номер вклада, описание, вклад)
+_Entry = Tuple[float, int, str, BankDeposit]
+
+
+class _RankingTable:
+    """
+    Таблица ранжирования вкладов одного срока.
+    Описание: Прибыль каждого вклада пропорциональна сумме внутри участка,
+              поэтому порядок вкладов меняется только на границах участков
+              (минимальная сумма, порог бонуса). Для каждой границы хранятся
+              только изменения списка (добавленные и удаленные записи), а полные
+              списки - в снимках, которые создаются примерно через каждые
+              min(2*sqrt(n), n/16) изменений. Память - O(n*sqrt(n)) вместо O(n^2)
+              при полном списке на каждом интервале; при круглых суммах границ
+              мало и снимок есть почти на каждой. Записи интервала выдаются слиянием ближайшего
+              снимка с изменениями после него, так что первые k записей
+              стоят O(sqrt(n) + k log n).
+    """
+    
+    # Минимальное число изменений между снимками
+    SNAPSHOT_MIN = 4
+    
+    def __init__(self):
+        """Инициализация пустой таблицы"""
+        self.bounds: List[float] = []
+        # Записи, добавляемые и удаляемые на каждой границе
+        self.adds: List[List[_Entry]] = []
+        self.removes: List[List[_Entry]] = []
+        # Снимки: граница -> список записей интервала, начинающегося с нее
+        self.snapshots: Dict[float, List[_Entry]] = {}
+        self.snapshot_bounds: List[float] = []
+        # Номер версии: add меняет снимки на месте, поэтому перебор записей
+        # проверяет, что таблица не изменилась
+        self.version = 0
+    
+    def build(self, group: Iterable[Tuple[int, BankDeposit]]) -> None:
+        """
+        Построение таблицы для набора вкладов за один проход по границам.
+        Параметры:
+            group: Пары (порядковый номер в каталоге, вклад); таблица должна быть пустой
+        """
+        events: Dict[float, Tuple[List[_Entry], List[_Entry]]] = {}
+        for seq, deposit in group:
+            previous = None
+            for start, entry in self._entries(deposit, seq):
+                adds, removes = events.setdefault(start, ([], []))
+                adds.append(entry)
+                if previous is not None:
+                    removes.append(previous)
+                previous = entry
+        
+        self.bounds = sorted(events)
+        self.adds = [events[bound][0] for bound in self.bounds]
+        self.removes = [events[bound][1] for bound in self.bounds]
+        # Каждый снимок собирается из предыдущего и изменений после него
+        base: List[_Entry] = []
+        size = applied = start = 0
+        for i, bound in enumerate(self.bounds):
+            size += len(self.adds[i]) - len(self.removes[i])
+            applied += len(self.adds[i]) + len(self.removes[i])
+            if applied > self._spacing(size):
+                added, removed, _ = self._collect(start, i + 1)
+                base = self.snapshots[bound] = self._rebuild(base, added, removed)
+                self.snapshot_bounds.append(bound)
+                start, applied = i + 1, 0
+    
+    def add(self, deposit: BankDeposit, seq: int) -> None:
+        """
+        Инкрементальное добавление вклада.
+        Описание: Новые границы вставляются со своими изменениями, снимки
+                  правее начала участка обновляются вставкой записи.
+        Параметры:
+            deposit: Добавляемый вклад
+            seq: Порядковый номер вклада в каталоге
+        """
+        self.version += 1
+        previous = None
+        for start, entry in self._entries(deposit, seq):
+            i = bisect_left(self.bounds, start)
+            if i == len(self.bounds) or self.bounds[i] != start:
+                self.bounds.insert(i, start)
+                self.adds.insert(i, [])
+                self.removes.insert(i, [])
+            self.adds[i].append(entry)
+            if previous is not None:
+                self.removes[i].append(previous)
+            for bound in self.snapshot_bounds[bisect_left(self.snapshot_bounds, start):]:
+                active = self.snapshots[bound]
+                if previous is not None:
+                    del active[bisect_left(active, previous)]
+                insort(active, entry)
+            previous = entry
+    
+    def interval(self, amount: float) -> int:
+        """
+        Номер интервала, содержащего сумму.
+        Параметры:
+            amount: Сумма вклада
+        Результат:
+            Номер начальной границы интервала (-1 - сумма меньше всех границ)
+        """
+        return bisect_right(self.bounds, amount) - 1
+    
+    def entries(self, amount: float) -> Iterable[_Entry]:
+        """
+        Записи интервала, содержащего сумму.
+        Параметры:
+            amount: Сумма вклада
+        Результат:
+            Итерируемая коллекция записей по убыванию прибыли
+        Примечание:
+            Если во время перебора в таблицу добавлен вклад, перебор
+            прерывается исключением RuntimeError.
+        """
+        i = self.interval(amount)
+        if i < 0:
+            return ()
+        return self._guard(self._entries_from(i))
+    
+    def _entries_from(self, i: int) -> Iterable[_Entry]:
+        """Записи интервала с номером i (снимок или слияние снимка с изменениями)"""
+        bound = self.bounds[i]
+        j = bisect_right(self.snapshot_bounds, bound) - 1
+        if j >= 0:
+            base = self.snapshots[self.snapshot_bounds[j]]
+            start = bisect_right(self.bounds, self.snapshot_bounds[j])
+        else:
+            base, start = [], 0
+        if start > i:
+            return base
+        
+        added, removed, applied = self._collect(start, i + 1)
+        # Далекий от снимка интервал запоминается новым снимком
+        if applied > self._spacing(len(base)):
+            insort(self.snapshot_bounds, bound)
+            active = self.snapshots[bound] = self._rebuild(base, added, removed)
+            return active
+        kept = (entry for entry in base if entry not in removed) if removed else base
+        return self._merge(kept, list(added))
+    
+    def _collect(self, start: int, stop: int) -> Tuple[Set[_Entry], Set[_Entry], int]:
+        """
+        Итог изменений на границах с номерами от start до stop (не включая).
+        Описание: Запись добавляется и удаляется не более раза, причем
+                  удаление - на более правой границе.
+        Результат:
+            Добавленные записи, удаленные записи и общее число изменений
+        """
+        added, removed = set(), set()
+        applied = 0
+        for k in range(start, stop):
+            removes = self.removes[k]
+            if removes:
+                cancelled = added.intersection(removes)
+                added -= cancelled
+                removed.update(removes)
+                removed -= cancelled
+            added.update(self.adds[k])
+            applied += len(self.adds[k]) + len(removes)
+        return added, removed, applied
+    
+    @staticmethod
+    def _rebuild(base: List[_Entry], added: Set[_Entry], removed: Set[_Entry]) -> List[_Entry]:
+        """Новый упорядоченный список: снимок с примененными изменениями"""
+        # Удаленные записи находятся двоичным поиском, остальное копируется срезами
+        active: List[_Entry] = []
+        previous = 0
+        for position in sorted(bisect_left(base, entry) for entry in removed):
+            active.extend(base[previous:position])
+            previous = position + 1
+        active.extend(base[previous:])
+        if not added:
+            return active
+        # Добавленные записи вставляются так же: позиции ищутся двоичным поиском
+        merged: List[_Entry] = []
+        previous = 0
+        for entry in sorted(added):
+            position = bisect_left(active, entry, previous)
+            merged.extend(active[previous:position])
+            merged.append(entry)
+            previous = position
+        merged.extend(active[previous:])
+        return merged
+    
+    @classmethod
+    def _spacing(cls, size: int) -> int:
+        """Число изменений, после которого создается снимок списка из size записей"""
+        # Небольшие списки дешевле хранить почти на каждой границе
+        return max(cls.SNAPSHOT_MIN, min(2 * isqrt(size), size // 16))
+    
+    def _guard(self, entries: Iterable[_Entry]) -> Iterator[_Entry]:
+        """Перебор записей с проверкой, что таблица не менялась"""
+        version = self.version
+        for entry in entries:
+            if self.version != version:
+                raise RuntimeError("Таблица ранжирования изменилась во время перебора")
+            yield entry
+    
+    @staticmethod
+    def _merge(kept: Iterable[_Entry], added: List[_Entry]) -> Iterator[_Entry]:
+        """Ленивое слияние упорядоченных записей с добавленными (через кучу)"""
+        heapify(added)
+        for entry in kept:
+            while added and added[0] < entry:
+                yield heappop(added)
+            yield entry
+        while added:
+            yield heappop(added)
+    
+    @staticmethod
+    def _entries(deposit: BankDeposit, seq: int) -> Iterator[Tuple[float, _Entry]]:
+        """Пары (начало участка, запись) для участков вклада"""
+        label = str(deposit)
+        for start, coef in deposit._profit_segments():
+            yield start, (-coef, seq, label, deposit)
+
 
 class DepositRecommender:
     """
     Класс для подбора оптимального вклада.
     Описание: Осуществляет поиск и сравнение вкладов по параметрам клиента.
+              Для каждого срока ведется таблица ранжирования (_RankingTable).
+              Вклады без описания участков прибыли подбираются перебором.
     """
     
-    def __init__(self):
-        """Инициализация с базовым набором вкладов"""
-        self.deposits = [
-            TermDeposit("Срочный стандарт", 10_000, 0.06, 12),
-            BonusDeposit("Бонусный плюс", 50_000, 0.07, 12, 100_000, 0.2),
-            CompoundDeposit("Капитализация", 30_000, 0.065, 12)
-        ]
+    def __init__(self, cache_size: int = 1024, amount_step: Optional[float] = None,
+                 deposits: Optional[Iterable[BankDeposit]] = None):
+        """
+        Инициализация с базовым набором вкладов.
+        Параметры:
+            cache_size: Максимальное число запомненных результатов recommend (0 - без кэша)
+            amount_step: Шаг округления суммы в ключе кэша (None - без округления)
+            deposits: Начальный набор вкладов (по умолчанию - базовый набор)
+        """
+        if cache_size < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        if amount_step is not None and amount_step <= 0:
+            raise ValueError("Шаг округления суммы должен быть положительным")
+        self._cache_size = cache_size
+        self._amount_step = amount_step
+        # Кэш хранит упорядоченные записи таблицы ранжирования, а не готовые
+        # результаты: прибыль всегда считается от переданной суммы
+        self._cache: "OrderedDict[Tuple[int, float], List[_Entry]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        
+        self._deposits: List[BankDeposit] = []
+        # Отложенные вклады: срок -> (класс, аргументы конструктора), создаются при первом запросе
+        self._pending: Dict[int, List[Tuple[type, tuple]]] = {}
+        # Таблицы ранжирования по срокам
+        self._tables: Dict[int, _RankingTable] = {}
+        # Вклады без описания участков прибыли (срок -> пары (номер, вклад)),
+        # они подбираются перебором при каждом запросе
+        self._scanned: Dict[int, List[Tuple[int, BankDeposit]]] = {}
+        if deposits is None:
+            deposits = (
+                TermDeposit("Срочный стандарт", 10_000, 0.06, 12),
+                BonusDeposit("Бонусный плюс", 50_000, 0.07, 12, 100_000, 0.2),
+                CompoundDeposit("Капитализация", 30_000, 0.065, 12)
+            )
+        self.add_deposits(deposits)
+    
+    @property
+    def deposits(self) -> List[BankDeposit]:
+        """Все вклады каталога (отложенные вклады при обращении создаются)"""
+        for period in sorted(self._pending):
+            self._materialize(period)
+        return self._deposits
     
     def add_deposit(self, deposit: BankDeposit) -> None:
         """
@@ -142,7 +485,127 @@ class DepositRecommender:
         Параметры:
             deposit: Экземпляр класса вклада
         """
-        self.deposits.append(deposit)
+        self._materialize(deposit.period)
+        self._insert(deposit)
+        self._invalidate({deposit.period})
+    
+    def _insert(self, deposit: BankDeposit) -> None:
+        """Добавление вклада в каталог и таблицу срока без очистки кэша"""
+        self._deposits.append(deposit)
+        table = self._tables.setdefault(deposit.period, _RankingTable())
+        if deposit._profit_segments() is None:
+            self._scanned.setdefault(deposit.period, []).append((len(self._deposits) - 1, deposit))
+        else:
+            table.add(deposit, len(self._deposits) - 1)
+    
+    def add_deposits(self, deposits: Iterable[BankDeposit]) -> None:
+        """
+        Добавление набора вкладов одним шагом.
+        Описание: Для сроков, которых еще нет в каталоге, таблица
+                  ранжирования строится сразу целиком, а не по одному вкладу.
+        Параметры:
+            deposits: Итерируемая коллекция вкладов
+        """
+        groups: Dict[int, List[BankDeposit]] = {}
+        for deposit in deposits:
+            groups.setdefault(deposit.period, []).append(deposit)
+        
+        for period, group in groups.items():
+            self._materialize(period)
+            if period in self._tables:
+                for deposit in group:
+                    self._insert(deposit)
+            else:
+                self._build_period(period, group)
+        # Кэш очищается один раз для каждого затронутого срока
+        self._invalidate(groups.keys())
+    
+    def add_deposits_lazy(self, specs: Iterable[Tuple[type, tuple]]) -> None:
+        """
+        Отложенное добавление вкладов.
+        Описание: Объекты вкладов и таблица для срока создаются только при
+                  первом запросе на этот срок.
+        Параметры:
+            specs: Пары (класс вклада, аргументы конструктора)
+        """
+        periods = set()
+        for cls, args in specs:
+            # Срок - четвертый аргумент конструктора любого вклада
+            period = args[3]
+            self._pending.setdefault(period, []).append((cls, args))
+            periods.add(period)
+        self._invalidate(periods)
+    
+    def _materialize(self, period: int) -> None:
+        """Создание отложенных вкладов для срока"""
+        specs = self._pending.pop(period, None)
+        if specs:
+            self.add_deposits(cls(*args) for cls, args in specs)
+    
+    def _invalidate(self, periods: Iterable[int]) -> None:
+        """Удаление из кэша результатов для сроков (результаты для других сроков остаются верными)"""
+        periods = set(periods)
+        if not periods or not self._cache:
+            return
+        for key in [key for key in self._cache if key[0] in periods]:
+            del self._cache[key]
+    
+    def _build_period(self, period: int, group: List[BankDeposit]) -> None:
+        """
+        Построение таблицы ранжирования для нового срока за один проход.
+        Параметры:
+            period: Срок вкладов
+            group: Вклады с этим сроком
+        """
+        first_seq = len(self._deposits)
+        self._deposits.extend(group)
+        ranked = []
+        for seq, deposit in enumerate(group, first_seq):
+            if deposit._profit_segments() is None:
+                self._scanned.setdefault(period, []).append((seq, deposit))
+            else:
+                ranked.append((seq, deposit))
+        table = self._tables[period] = _RankingTable()
+        table.build(ranked)
+    
+    def _ranked_for(self, amount: float, period: int) -> Iterable[_Entry]:
+        """
+        Поиск интервала таблицы ранжирования, содержащего сумму.
+        Параметры:
+            amount: Сумма вклада
+            period: Желаемый срок (месяцев)
+        Результат:
+            Записи таблицы по убыванию прибыли
+        """
+        self._materialize(period)
+        table = self._tables.get(period)
+        if table is None:
+            return []
+        return table.entries(amount)
+    
+    def _records(self, amount: float, period: int, ranked: Iterable[_Entry]) -> Iterator[Dict[str, Union[str, float]]]:
+        """
+        Рекомендации по записям таблицы с добавлением вкладов, подбираемых перебором.
+        Параметры:
+            amount: Сумма вклада
+            period: Желаемый срок (месяцев)
+            ranked: Записи таблицы ранжирования по убыванию прибыли
+        Результат:
+            Генератор словарей с информацией о подходящих вкладах
+        """
+        profits: Dict[int, float] = {}
+        scanned: List[_Entry] = []
+        for seq, deposit in self._scanned.get(period, ()):
+            if amount >= deposit.min_amount:
+                profit = profits[seq] = deposit.calculate_profit(amount)
+                # Порядок по прибыли на 1 ₽ совпадает с порядком записей таблицы
+                scanned.append((-profit / amount if amount else 0.0, seq, str(deposit), deposit))
+        if scanned:
+            scanned.sort()
+            ranked = merge(ranked, scanned)
+        for neg_coef, seq, label, _ in ranked:
+            profit = profits[seq] if seq in profits else amount * -neg_coef
+            yield self._record(amount, profit, label)
     
     def recommend(self, amount: float, period: int) -> List[Dict[str, Union[str, float]]]:
         """
@@ -152,22 +615,153 @@ class DepositRecommender:
             period: Желаемый срок (месяцев)
         Результат:
             Список словарей с информацией о подходящих вкладах
+        Примечание:
+            Если задан amount_step, результаты для сумм одного шага
+            используют общую запись кэша, но только когда весь шаг лежит
+            внутри одного интервала таблицы ранжирования.
         """
-        recommendations = []
+        if not self._cache_size:
+            return list(self.iter_recommend(amount, period))
         
-        for deposit in self.deposits:
-            if deposit.period == period and amount >= deposit.min_amount:
-                try:
-                    profit = deposit.calculate_profit(amount)
-                    recommendations.append({
-                        'deposit': str(deposit),
-                        'profit': profit,
-                        'total': amount + profit
-                    })
-                except ValueError:
-                    continue
+        key = (period, self._cache_amount(amount, period))
+        ranked = self._cache.get(key)
+        if ranked is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+        else:
+            self._misses += 1
+            ranked = self._cache[key] = list(self._ranked_for(amount, period))
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+        return list(self._records(amount, period, ranked))
+    
+    def _cache_amount(self, amount: float, period: int) -> float:
+        """
+        Сумма для ключа кэша.
+        Описание: Сумма ключа всегда лежит в том же интервале таблицы, что и
+                  исходная, поэтому порядок вкладов для них одинаков.
+        Параметры:
+            amount: Сумма вклада
+            period: Желаемый срок (месяцев)
+        Результат:
+            Сумма, округленная до amount_step, или исходная сумма
+        """
+        step = self._amount_step
+        if step is None:
+            return amount
+        bucket = round(amount / step) * step
+        self._materialize(period)
+        table = self._tables.get(period)
+        if table is None or table.interval(bucket - step / 2) == table.interval(bucket + step / 2):
+            return bucket
+        return amount
+    
+    @staticmethod
+    def _record(amount: float, profit: float, label: str) -> Dict[str, Union[str, float]]:
+        """Словарь рекомендации для суммы, прибыли и описания вклада"""
+        return {
+            'deposit': label,
+            'profit': profit,
+            'total': amount + profit
+        }
+    
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Статистика кэша рекомендаций.
+        Результат:
+            Словарь с числом попаданий, промахов, вытеснений и текущим размером
+        """
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'size': len(self._cache),
+            'maxsize': self._cache_size
+        }
+    
+    def cache_clear(self) -> None:
+        """Очистка кэша рекомендаций и сброс статистики"""
+        self._cache.clear()
+        self._hits = self._misses = self._evictions = 0
+    
+    def recommend_top(self, amount: float, period: int, k: int) -> List[Dict[str, Union[str, float]]]:
+        """
+        Подбор k лучших вкладов по параметрам клиента.
+        Описание: Прибыль рассчитывается только для первых k записей
+                  упорядоченного интервала.
+        Параметры:
+            amount: Сумма вклада
+            period: Желаемый срок (месяцев)
+            k: Количество лучших вкладов
+        Результат:
+            Список из не более чем k словарей по убыванию прибыли
+        """
+        if k <= 0:
+            return []
+        return list(islice(self.iter_recommend(amount, period), k))
+    
+    def iter_recommend(self, amount: float, period: int) -> Iterator[Dict[str, Union[str, float]]]:
+        """
+        Ленивый подбор вкладов в порядке убывания прибыли.
+        Параметры:
+            amount: Сумма вклада
+            period: Желаемый срок (месяцев)
+        Результат:
+            Генератор словарей с информацией о подходящих вкладах
+        Примечание:
+            Добавление вклада того же срока во время перебора прерывает
+            генератор исключением RuntimeError (как изменение словаря при обходе).
+        """
+        yield from self._records(amount, period, self._ranked_for(amount, period))
+    
+    def recommend_batch(self, clients: Iterable[Tuple[float, int]], workers: Optional[int] = None,
+                        chunk_size: int = 10_000) -> Iterator[List[Dict[str, Union[str, float]]]]:
+        """
+        Пакетный подбор вкладов для большого списка клиентов.
+        Описание: Запросы делятся на пакеты и обрабатываются пулом процессов.
+                  Каталог передается каждому процессу один раз при запуске,
+                  результаты возвращаются потоком в исходном порядке.
+                  В обработке одновременно не больше двух пакетов на процесс,
+                  поэтому поток запросов читается по мере выдачи результатов.
+        Параметры:
+            clients: Итерируемая коллекция пар (сумма, срок)
+            workers: Количество процессов (по умолчанию - число ядер, 1 - без пула)
+            chunk_size: Количество запросов в одном пакете
+        Результат:
+            Генератор списков рекомендаций, по одному на каждого клиента
+        """
+        # Проверка до создания генератора, чтобы ошибка возникала при вызове
+        if chunk_size <= 0:
+            raise ValueError("Размер пакета должен быть положительным")
+        return self._recommend_batch(_chunked(clients, chunk_size), workers)
+    
+    def _recommend_batch(self, chunks: Iterator[List[Tuple[float, int]]],
+                         workers: Optional[int]) -> Iterator[List[Dict[str, Union[str, float]]]]:
+        """
+        Обработка пакетов запросов для recommend_batch.
+        Параметры:
+            chunks: Поток пакетов запросов
+            workers: Количество процессов (None - число ядер, 1 - без пула)
+        Результат:
+            Генератор списков рекомендаций в исходном порядке
+        """
+        if workers == 1:
+            for chunk in chunks:
+                yield from (self.recommend(amount, period) for amount, period in chunk)
+            return
         
-        return sorted(recommendations, key=lambda x: x['profit'], reverse=True)
+        window = 2 * (workers or os.cpu_count() or 1)
+        with Pool(workers, initializer=_init_batch_worker, initargs=(self,)) as pool:
+            # Pool.imap читает весь поток пакетов без ограничения, поэтому
+            # задачи отправляются окном фиксированного размера
+            pending: Deque[AsyncResult] = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_recommend_chunk, (chunk,)))
+                if len(pending) >= window:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
     
     def __call__(self, amount: float, period: int) -> None:
         """
@@ -186,4 +780,30 @@ class DepositRecommender:
         for i, rec in enumerate(recs, 1):
             print(f"{i}. {rec['deposit']}")
             print(f"   Прибыль: {rec['profit']:.2f} ₽")
-            print(f"   Итоговая сумма: {rec['total']:.2f} ₽\n")
\ No newline at end of file
+            print(f"   Итоговая сумма: {rec['total']:.2f} ₽\n")
+
+
+# Рекомендатель, переданный процессу пула при запуске
+_batch_recommender: Optional[DepositRecommender] = None
+
+
+def _init_batch_worker(recommender: DepositRecommender) -> None:
+    """Сохраняет каталог в процессе пула для последующих пакетов"""
+    global _batch_recommender
+    _batch_recommender = recommender
+
+
+def _recommend_chunk(chunk: List[Tuple[float, int]]) -> List[List[Dict[str, Union[str, float]]]]:
+    """Подбор вкладов для одного пакета запросов в процессе пула"""
+    recommend = _batch_recommender.recommend
+    return [recommend(amount, period) for amount, period in chunk]
+
+
+def _chunked(items: Iterable[Tuple[float, int]], size: int) -> Iterator[List[Tuple[float, int]]]:
+    """Разбивает поток запросов на списки длиной не более size"""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
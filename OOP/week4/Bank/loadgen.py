@@ -0,0 +1,95 @@
+import asyncio
+import json
+import random
+import time
+from typing import List
+
+from deposit import DepositRecommender
+from service import RecommendationService
+
+
+async def _client(host: str, port: int, requests: int, amounts: List[int],
+                  periods: List[int], latencies: List[float]) -> None:
+    """
+    Клиент с одним keep-alive соединением, отправляющий запросы последовательно.
+    Параметры:
+        host: Адрес сервиса
+        port: Порт сервиса
+        requests: Количество запросов
+        amounts: Набор сумм для запросов
+        periods: Набор сроков для запросов
+        latencies: Список для записи задержек (мс)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            target = f"/recommend?amount={random.choice(amounts)}&period={random.choice(periods)}"
+            started = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+            await writer.drain()
+
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Перцентиль по отсортированному списку"""
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+async def run_load(host: str, port: int, connections: int = 50, requests: int = 200,
+                   distinct_amounts: int = 20) -> None:
+    """
+    Нагрузочное тестирование сервиса и вывод результатов.
+    Параметры:
+        host: Адрес сервиса
+        port: Порт сервиса
+        connections: Количество одновременных соединений
+        requests: Количество запросов на соединение
+        distinct_amounts: Количество различных сумм (меньше - больше объединений запросов)
+    """
+    amounts = [random.randint(1, 30) * 10_000 for _ in range(distinct_amounts)]
+    latencies: List[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, requests, amounts, [12, 24], latencies)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"Запросов: {len(latencies)} за {elapsed:.2f} с ({len(latencies) / elapsed:.0f} в секунду)")
+    print(f"Задержка: p50 {_percentile(latencies, 50):.2f} мс, "
+          f"p95 {_percentile(latencies, 95):.2f} мс, p99 {_percentile(latencies, 99):.2f} мс")
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /metrics HTTP/1.1\r\nConnection: close\r\n\r\n")
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    print("Метрики сервиса:", json.loads(response.partition(b'\r\n\r\n')[2]))
+
+
+async def main() -> None:
+    """Запуск сервиса на свободном порту и нагрузка на него в одном процессе"""
+    service = RecommendationService(DepositRecommender(), workers=2)
+    await service.start('127.0.0.1', 0)
+    try:
+        await run_load('127.0.0.1', service.port)
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
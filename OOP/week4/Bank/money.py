@@ -0,0 +1,134 @@
+from decimal import Decimal
+from fractions import Fraction
+from math import ceil
+from typing import Iterable, List, Tuple, Union
+
+from deposit import BankDeposit
+
+# Правила округления результата до копейки
+ROUND_HALF_EVEN = 'half_even'  # банковское округление
+ROUND_HALF_UP = 'half_up'      # половина копейки округляется вверх
+ROUND_DOWN = 'down'            # отбрасывание дробной части копейки
+
+_ROUNDINGS = (ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_DOWN)
+
+
+def _exact(value: Union[int, float, str, Decimal]) -> Fraction:
+    """
+    Точное преобразование параметра вклада в рациональное число.
+    Описание: float преобразуется через десятичную запись, поэтому 0.065
+              становится ровно 13/200, а не двоичным приближением.
+    """
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    return Fraction(value)
+
+
+def to_kopecks(amount: Union[int, str, Decimal]) -> int:
+    """
+    Перевод суммы в рублях в целое число копеек.
+    Параметры:
+        amount: Сумма в рублях (целое, строка или Decimal, не более двух знаков после запятой)
+    Результат:
+        Сумма в копейках
+    """
+    kopecks = Fraction(amount) * 100
+    if kopecks.denominator != 1:
+        raise ValueError(f"Сумма {amount} содержит доли копейки")
+    return int(kopecks)
+
+
+def _round_div(numerator: int, denominator: int, rounding: str) -> int:
+    """
+    Целочисленное деление с заданным правилом округления.
+    Параметры:
+        numerator: Делимое
+        denominator: Делитель (положительный)
+        rounding: Правило округления
+    Результат:
+        Округленное частное
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    if rounding == ROUND_DOWN or remainder == 0:
+        # divmod округляет к минус бесконечности, для отрицательных сумм - к нулю
+        return quotient + 1 if numerator < 0 and remainder else quotient
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and
+                               (rounding == ROUND_HALF_UP and numerator > 0 or
+                                rounding == ROUND_HALF_EVEN and quotient % 2)):
+        return quotient + 1
+    return quotient
+
+
+class FixedPointDeposit:
+    """
+    Точный расчет прибыли по вкладу в целых копейках.
+    Описание: Коэффициенты прибыли вклада (в том числе множитель капитализации
+              (1 + r/12) ** period) один раз вычисляются как точные дроби.
+              Расчет для суммы сводится к целочисленному умножению и делению
+              с округлением до копейки по выбранному правилу один раз в конце.
+    """
+
+    def __init__(self, deposit: BankDeposit, rounding: str = ROUND_HALF_EVEN):
+        """
+        Инициализация точного расчета для вклада.
+        Параметры:
+            deposit: Экземпляр класса вклада
+            rounding: Правило округления до копейки
+        """
+        if rounding not in _ROUNDINGS:
+            raise ValueError(f"Неизвестное правило округления: {rounding}")
+        if deposit._profit_segments() is None:
+            raise TypeError("Для точного расчета вклад должен описывать участки прибыли")
+        self.deposit = deposit
+        self.rounding = rounding
+        # Участки: (минимальная сумма участка в копейках, числитель, знаменатель)
+        self._segments: List[Tuple[int, int, int]] = [
+            (ceil(start * 100), coef.numerator, coef.denominator)
+            for start, coef in deposit._profit_segments(_exact)
+        ]
+        self.min_kopecks = self._segments[0][0]
+
+    def profit(self, amount: int) -> int:
+        """
+        Расчет прибыли.
+        Параметры:
+            amount: Сумма вклада в копейках
+        Результат:
+            Размер прибыли в копейках
+        """
+        if amount < self.min_kopecks:
+            raise ValueError(f"Минимальная сумма вклада {self.deposit.min_amount:.2f} ₽")
+        for start, numerator, denominator in reversed(self._segments):
+            if amount >= start:
+                return _round_div(amount * numerator, denominator, self.rounding)
+
+    def profit_many(self, amounts: Iterable[int]) -> List[Union[int, None]]:
+        """
+        Расчет прибыли для набора сумм без исключений.
+        Параметры:
+            amounts: Суммы вклада в копейках
+        Результат:
+            Список прибыли в копейках (None для сумм меньше минимальной)
+        """
+        rounding = self.rounding
+        segments = self._segments[::-1]
+        min_kopecks = self.min_kopecks
+        result = []
+        for amount in amounts:
+            if amount < min_kopecks:
+                result.append(None)
+                continue
+            for start, numerator, denominator in segments:
+                if amount >= start:
+                    result.append(_round_div(amount * numerator, denominator, rounding))
+                    break
+        return result
+
+    def __call__(self, amount: int) -> int:
+        """Вызываемый метод для расчета прибыли в копейках"""
+        return self.profit(amount)
+
+    def __str__(self) -> str:
+        """Строковое представление точного расчета"""
+        return f"{self.deposit} [копейки, округление {self.rounding}]"
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import math
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from deposit import DepositRecommender
+
+# Границы корзин гистограммы задержек (мс), последняя корзина - все, что больше
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 500: 'Internal Server Error'}
+_BAD_REQUEST = b'{"error": "bad request"}'
+
+# Рекомендатель в процессе пула
+_worker_recommender: Optional[DepositRecommender] = None
+
+
+def _init_worker(recommender: DepositRecommender) -> None:
+    """Сохраняет каталог в процессе пула"""
+    global _worker_recommender
+    _worker_recommender = recommender
+
+
+def _ping() -> None:
+    """Пустая задача для запуска процессов пула"""
+
+
+def _recommend(amount: float, period: int) -> bytes:
+    """Подбор вкладов в процессе пула, результат сразу сериализуется в JSON"""
+    recs = _worker_recommender.recommend(amount, period)
+    return json.dumps(recs, ensure_ascii=False).encode('utf-8')
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек обработки запросов.
+    Описание: Считает количество запросов в корзинах LATENCY_BUCKETS_MS.
+    """
+
+    def __init__(self):
+        """Инициализация пустой гистограммы"""
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        """
+        Учет одного запроса.
+        Параметры:
+            ms: Задержка в миллисекундах
+        """
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def __call__(self) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        """Вызываемый метод, возвращает состояние гистограммы"""
+        buckets = {f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.counts)}
+        buckets['inf'] = self.counts[-1]
+        return {
+            'count': self.total,
+            'mean_ms': self.sum_ms / self.total if self.total else 0.0,
+            'buckets': buckets
+        }
+
+
+class RecommendationService:
+    """
+    HTTP/1.1 сервис подбора вкладов на asyncio.
+    Описание: Обслуживает GET /recommend?amount=...&period=... и GET /metrics.
+              Соединения поддерживают keep-alive. Одновременные одинаковые
+              запросы объединяются в один расчет, расчеты выполняются пулом
+              процессов фиксированного размера.
+    """
+
+    def __init__(self, recommender: DepositRecommender, workers: int = 2):
+        """
+        Инициализация сервиса.
+        Параметры:
+            recommender: Рекомендатель с каталогом вкладов
+            workers: Количество процессов для расчетов
+        """
+        self.recommender = recommender
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Расчеты в работе: (сумма, срок) -> будущий результат
+        self._inflight: Dict[Tuple[float, int], asyncio.Future] = {}
+        # Открытые соединения: задача обработки -> поток записи
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.computed = 0
+        self.coalesced = 0
+        self.connections = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> None:
+        """
+        Запуск сервиса.
+        Параметры:
+            host: Адрес для прослушивания
+            port: Порт (0 - выбрать свободный)
+        """
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(self.recommender,))
+        # Процессы пула запускаются до приема соединений: иначе при fork они
+        # унаследуют сокет первого клиента, и его закрытие не дойдет до клиента
+        await asyncio.get_running_loop().run_in_executor(self._executor, _ping)
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    @property
+    def port(self) -> int:
+        """Порт, на котором работает сервис"""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Обслуживание запросов до остановки"""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """Остановка сервиса и пула процессов"""
+        self._server.close()
+        # Закрытие соединений завершает ожидающие обработчики штатно, без отмены задач
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._executor.shutdown()
+
+    async def _recommend(self, amount: float, period: int) -> bytes:
+        """Подбор вкладов с объединением одинаковых одновременных запросов"""
+        key = (amount, period)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, _recommend, amount, period)
+        self._inflight[key] = future
+        self.computed += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+
+    def metrics(self) -> Dict[str, object]:
+        """Текущие метрики сервиса"""
+        return {
+            'connections': self.connections,
+            'computed': self.computed,
+            'coalesced': self.coalesced,
+            'inflight': len(self._inflight),
+            'latency': {path: hist() for path, hist in self.histograms.items()}
+        }
+
+    async def _route(self, method: str, target: str) -> Tuple[int, bytes]:
+        """
+        Обработка одного запроса.
+        Результат:
+            Пара (код ответа, тело ответа в JSON)
+        """
+        url = urlsplit(target)
+        if url.path not in ('/recommend', '/metrics'):
+            return 404, b'{"error": "not found"}'
+        if method != 'GET':
+            return 405, b'{"error": "method not allowed"}'
+        if url.path == '/metrics':
+            return 200, json.dumps(self.metrics()).encode('utf-8')
+
+        query = parse_qs(url.query)
+        try:
+            amount = float(query['amount'][0])
+            period = int(query['period'][0])
+        except (KeyError, ValueError):
+            return 400, b'{"error": "amount and period are required"}'
+        # nan и inf дали бы в ответе недопустимый JSON
+        if not math.isfinite(amount):
+            return 400, b'{"error": "amount must be a finite number"}'
+        return 200, await self._recommend(amount, period)
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, body: bytes, keep_alive: bool) -> None:
+        """Отправка ответа с телом JSON"""
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            .encode('latin-1') + body
+        )
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обслуживание одного соединения (несколько запросов при keep-alive)"""
+        self.connections += 1
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    started = time.perf_counter()
+                    method, target, version = request_line.decode('latin-1').split()
+                    if not version.startswith('HTTP/'):
+                        raise ValueError(version)
+
+                    headers: Dict[str, str] = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get('content-length', 0) or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Некорректная строка запроса, строка длиннее предела StreamReader или
+                    # некорректный Content-Length: граница следующего запроса неизвестна,
+                    # поэтому клиенту отвечает 400 и соединение закрывается
+                    await self._respond(writer, 400, _BAD_REQUEST, False)
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                try:
+                    status, body = await self._route(method, target)
+                except Exception:
+                    status, body = 500, b'{"error": "internal error"}'
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                              else connection == 'keep-alive')
+                await self._respond(writer, status, body, keep_alive)
+
+                path = urlsplit(target).path
+                if path not in ('/recommend', '/metrics'):
+                    path = 'other'
+                self.histograms.setdefault(path, LatencyHistogram()).observe(
+                    (time.perf_counter() - started) * 1000)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            del self._connections[task]
+            writer.close()
+
+
+async def main(host: str = '127.0.0.1', port: int = 8080, workers: int = 2) -> None:
+    """Запуск сервиса с базовым набором вкладов"""
+    service = RecommendationService(DepositRecommender(), workers)
+    await service.start(host, port)
+    print(f"Сервис подбора вкладов: http://{host}:{service.port}/recommend?amount=150000&period=12")
+    await service.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from deposit import BankDeposit, TermDeposit, BonusDeposit, CompoundDeposit
+
+
+class RateScenarioSimulator:
+    """
+    Монте-Карло моделирование доходности вкладов с плавающей ставкой.
+    Описание: Ставка каждого вклада пересматривается ежемесячно: к базовой ставке
+              добавляется общее для всех вкладов отклонение, которое моделируется
+              процессом с возвратом к нулю. Сценарии хранятся матрицей
+              (сценарии × месяцы), расчет прибыли ведется операциями NumPy.
+    """
+
+    PERCENTILES = (5, 50, 95)
+
+    def __init__(self, sigma: float = 0.005, kappa: float = 0.1, floor: float = 0.0):
+        """
+        Инициализация параметров модели ставки.
+        Параметры:
+            sigma: Месячная волатильность отклонения ставки (в долях от 1)
+            kappa: Скорость возврата отклонения к нулю за месяц
+            floor: Минимально допустимая ставка
+        """
+        if sigma < 0:
+            raise ValueError("Волатильность не может быть отрицательной")
+        if not 0 <= kappa <= 1:
+            raise ValueError("Скорость возврата должна быть в диапазоне [0, 1]")
+        self.sigma = sigma
+        self.kappa = kappa
+        self.floor = floor
+
+    def shifts(self, scenarios: int, months: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Генерация отклонений ставки.
+        Параметры:
+            scenarios: Количество сценариев
+            months: Количество месяцев
+            rng: Генератор случайных чисел
+        Результат:
+            Матрица отклонений (сценарии × месяцы)
+        """
+        shocks = rng.standard_normal((scenarios, months)) * self.sigma
+        result = np.empty_like(shocks)
+        current = np.zeros(scenarios)
+        keep = 1 - self.kappa
+        # Рекурсия по месяцам неизбежна, но каждый шаг обрабатывает все сценарии сразу
+        for month in range(months):
+            current = current * keep + shocks[:, month]
+            result[:, month] = current
+        return result
+
+    def profits(self, deposit: BankDeposit, amount: float, shifts: np.ndarray) -> np.ndarray:
+        """
+        Прибыль вклада во всех сценариях.
+        Параметры:
+            deposit: Экземпляр класса вклада
+            amount: Сумма вклада (не меньше минимальной)
+            shifts: Матрица отклонений ставки, не короче срока вклада
+        Результат:
+            Массив прибыли по сценариям
+        """
+        if amount < deposit.min_amount:
+            raise ValueError(f"Минимальная сумма вклада {deposit.min_amount:.2f} ₽")
+        rates = np.maximum(deposit.rate + shifts[:, :deposit.period], self.floor)
+
+        if isinstance(deposit, CompoundDeposit):
+            return amount * (np.prod(1 + rates / 12, axis=1) - 1)
+        if isinstance(deposit, (TermDeposit, BonusDeposit)):
+            profit = amount * rates.sum(axis=1) / 12
+            if isinstance(deposit, BonusDeposit) and amount >= deposit.bonus_threshold:
+                profit *= 1 + deposit.bonus_rate
+            return profit
+        raise TypeError(f"Неизвестный тип вклада: {type(deposit).__name__}")
+
+    def simulate_block(self, deposits: Sequence[BankDeposit], amount: float,
+                       scenarios: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+        """
+        Моделирование одного блока сценариев для всех подходящих вкладов.
+        Параметры:
+            deposits: Вклады каталога
+            amount: Сумма вклада
+            scenarios: Количество сценариев в блоке
+            seed: Зерно генератора для блока
+        Результат:
+            Словарь: описание вклада (str) -> массив прибыли по сценариям
+        """
+        eligible = [d for d in deposits if amount >= d.min_amount]
+        if not eligible:
+            return {}
+        months = max(d.period for d in eligible)
+        shifts = self.shifts(scenarios, months, np.random.default_rng(seed))
+        # Ключ - полное описание: вклады с одинаковым названием не перезаписывают друг друга
+        return {str(d): self.profits(d, amount, shifts) for d in eligible}
+
+    def run(self, deposits: Sequence[BankDeposit], amount: float, scenarios: int = 100_000,
+            seed: Optional[int] = None, workers: int = 1,
+            block_size: int = 25_000) -> Dict[str, Dict[str, float]]:
+        """
+        Моделирование каталога вкладов и расчет статистики риска.
+        Параметры:
+            deposits: Вклады каталога
+            amount: Сумма вклада
+            scenarios: Общее количество сценариев
+            seed: Зерно генератора (результат не зависит от числа процессов)
+            workers: Количество процессов (1 - расчет в текущем процессе)
+            block_size: Количество сценариев в одном блоке
+        Результат:
+            Словарь: описание вклада (str) -> среднее, стандартное отклонение и перцентили прибыли
+        """
+        if scenarios <= 0 or block_size <= 0:
+            raise ValueError("Количество сценариев и размер блока должны быть положительными")
+        sizes = [block_size] * (scenarios // block_size)
+        if scenarios % block_size:
+            sizes.append(scenarios % block_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        args = ([deposits] * len(sizes), [amount] * len(sizes), sizes, seeds)
+
+        if workers == 1:
+            blocks = list(map(self.simulate_block, *args))
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                blocks = list(pool.map(self.simulate_block, *args))
+
+        report = {}
+        for label in blocks[0]:
+            profits = np.concatenate([block[label] for block in blocks])
+            stats = {'mean': float(profits.mean()), 'std': float(profits.std())}
+            for q, value in zip(self.PERCENTILES, np.percentile(profits, self.PERCENTILES)):
+                stats[f'p{q}'] = float(value)
+            report[label] = stats
+        return report
+
+
+def print_report(report: Dict[str, Dict[str, float]], amount: float) -> None:
+    """
+    Вывод статистики моделирования.
+    Параметры:
+        report: Результат RateScenarioSimulator.run
+        amount: Сумма вклада
+    """
+    if not report:
+        print("Нет подходящих вкладов для указанных условий")
+        return
+    print(f"\nПрибыль для суммы {amount:.2f} ₽ при плавающей ставке:")
+    for label, stats in report.items():
+        print(f"{label}: среднее {stats['mean']:.2f} ₽, σ {stats['std']:.2f} ₽, "
+              f"5% {stats['p5']:.2f} ₽, 95% {stats['p95']:.2f} ₽")
+
+
+if __name__ == "__main__":
+    from deposit import DepositRecommender
+
+    simulator = RateScenarioSimulator()
+    report = simulator.run(DepositRecommender().deposits, 150_000, scenarios=100_000, seed=1)
+    print_report(report, 150_000)
@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, TextIO, Tuple
 from datetime import datetime, timedelta
+import csv
+import json
+
+# Поля статуса билета; каждый класс заполняет начало этого списка
+_ПОЛЯ_СТАТУСА = ('номер', 'активирован', 'дата_активации',
+                 'дата_окончания', 'действителен', 'поездки')
+
 
 class ПроезднойБилет(ABC):
     """
@@ -52,17 +59,26 @@ class ПроезднойБилет(ABC):
         """Проверяет активен ли билет"""
         return self._активирован
     
+    def _статус(self, момент: datetime) -> Tuple[Any, ...]:
+        """
+        Значения статуса билета.
+        Описание: Подклассы дополняют кортеж базового класса своими значениями
+                  в порядке _ПОЛЯ_СТАТУСА.
+        Параметры:
+            момент: Опорное время для проверки действительности
+        Результат:
+            Кортеж значений первых полей _ПОЛЯ_СТАТУСА
+        """
+        return (self._номер, self._активирован,
+                self._дата_активации.isoformat() if self._активирован else None)
+    
     def __call__(self) -> Dict[str, Any]:
         """
         Вызываемый метод, возвращает информацию о билете.
         Результат:
             Словарь с основной информацией о билете
         """
-        return {
-            'номер': self._номер,
-            'активирован': self._активирован,
-            'дата_активации': self._дата_активации.isoformat() if self._активирован else None
-        }
+        return dict(zip(_ПОЛЯ_СТАТУСА, self._статус(datetime.now())))
     
     def __str__(self) -> str:
         """Строковое представление билета"""
@@ -89,9 +105,19 @@ class БилетСОграничением(ПроезднойБилет):
     @property
     def действителен(self) -> bool:
         """Проверяет действительность билета"""
+        return self.действителен_на(datetime.now())
+    
+    def действителен_на(self, момент: datetime) -> bool:
+        """
+        Проверяет действительность билета.
+        Параметры:
+            момент: Опорное время
+        Результат:
+            True если билет активирован и срок его действия не истек
+        """
         if not self._активирован:
             return False
-        return datetime.now() < self._дата_окончания
+        return момент < self._дата_окончания
     
     def активировать(self) -> None:
         """Активирует билет и устанавливает дату окончания"""
@@ -100,12 +126,10 @@ class БилетСОграничением(ПроезднойБилет):
             self._дата_окончания = self._дата_активации + self._срок_действия
             print(f"Билет действителен до {self._дата_окончания}")
     
-    def __call__(self) -> Dict[str, Any]:
-        """Дополняет информацию о билете данными об окончании действия"""
-        data = super().__call__()
-        data['дата_окончания'] = self._дата_окончания.isoformat() if self._дата_окончания else None
-        data['действителен'] = self.действителен
-        return data
+    def _статус(self, момент: datetime) -> Tuple[Any, ...]:
+        """Дополняет статус билета данными об окончании действия"""
+        окончание = self._дата_окончания.isoformat() if self._дата_окончания else None
+        return super()._статус(момент) + (окончание, self.действителен_на(момент))
 
 class БилетСОграничениемПоездок(БилетСОграничением):
     """
@@ -139,11 +163,9 @@ class БилетСОграничениемПоездок(БилетСОгран
         print(f"Списана поездка. Осталось: {self._осталось_поездок}/{self._количество_поездок}")
         return True
     
-    def __call__(self) -> Dict[str, Any]:
-        """Дополняет информацию о билете данными о поездках"""
-        data = super().__call__()
-        data['поездки'] = f"{self._осталось_поездок}/{self._количество_поездок}"
-        return data
+    def _статус(self, момент: datetime) -> Tuple[Any, ...]:
+        """Дополняет статус билета данными о поездках"""
+        return super()._статус(момент) + (f"{self._осталось_поездок}/{self._количество_поездок}",)
     
     def __str__(self) -> str:
         """Строковое представление билета"""
@@ -179,9 +201,19 @@ class БезлимитныйБилет(ПроезднойБилет):
     @property
     def действителен(self) -> bool:
         """Проверяет действительность билета"""
+        return self.действителен_на(datetime.now())
+    
+    def действителен_на(self, момент: datetime) -> bool:
+        """
+        Проверяет действительность билета.
+        Параметры:
+            момент: Опорное время
+        Результат:
+            True если билет активирован и срок его действия не истек
+        """
         if not self._активирован:
             return False
-        return datetime.now() < self._дата_окончания
+        return момент < self._дата_окончания
     
     def активировать(self) -> None:
         """Активирует билет и устанавливает дату окончания"""
@@ -190,14 +222,70 @@ class БезлимитныйБилет(ПроезднойБилет):
             self._дата_окончания = self._дата_активации + self._срок_действия
             print(f"Билет действителен до {self._дата_окончания}")
     
-    def __call__(self) -> Dict[str, Any]:
-        """Дополняет информацию о билете данными об окончании действия"""
-        data = super().__call__()
-        data['дата_окончания'] = self._дата_окончания.isoformat() if self._дата_окончания else None
-        data['действителен'] = self.действителен
-        return data
+    def _статус(self, момент: datetime) -> Tuple[Any, ...]:
+        """Дополняет статус билета данными об окончании действия"""
+        окончание = self._дата_окончания.isoformat() if self._дата_окончания else None
+        return super()._статус(момент) + (окончание, self.действителен_на(момент))
     
     def __str__(self) -> str:
         """Строковое представление билета"""
         base = super().__str__()
-        return f"{base} Безлимитный (до {self._дата_окончания})"
\ No newline at end of file
+        return f"{base} Безлимитный (до {self._дата_окончания})"
+
+def _статус_билета(билет: ПроезднойБилет, момент: datetime) -> Tuple[Any, ...]:
+    """
+    Формирует статус билета в виде кортежа без построения промежуточного словаря.
+    Параметры:
+        билет: Экземпляр билета
+        момент: Опорное время для проверки действительности
+    Результат:
+        Кортеж значений в порядке _ПОЛЯ_СТАТУСА (недостающие поля - None)
+    """
+    статус = билет._статус(момент)
+    return статус + (None,) * (len(_ПОЛЯ_СТАТУСА) - len(статус))
+
+
+def export_status(tickets: Iterable[ПроезднойБилет], out: TextIO, fmt: str = 'csv',
+                  момент: Optional[datetime] = None, размер_пакета: int = 10_000) -> int:
+    """
+    Потоковая выгрузка статуса большого количества билетов.
+    Описание: Действительность всех билетов проверяется относительно одного
+              опорного времени, строки пишутся в поток пакетами.
+    Параметры:
+        tickets: Итерируемая коллекция билетов (может быть генератором)
+        out: Текстовый поток для записи
+        fmt: Формат выгрузки: 'csv' или 'jsonl'
+        момент: Опорное время (по умолчанию datetime.now() на момент вызова)
+        размер_пакета: Количество строк, накапливаемых перед записью
+    Результат:
+        Количество выгруженных билетов
+    """
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"Неподдерживаемый формат выгрузки: {fmt}")
+    if момент is None:
+        момент = datetime.now()
+
+    if fmt == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(_ПОЛЯ_СТАТУСА)
+        записать = writer.writerows
+    else:
+        # Шаблон строки JSON собирается один раз, значения подставляются позиционно
+        шаблон = '{{' + ', '.join(f'"{поле}": {{}}' for поле in _ПОЛЯ_СТАТУСА) + '}}\n'
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+        def записать(пакет):
+            out.write(''.join(шаблон.format(*map(dumps, строка)) for строка in пакет))
+
+    всего = 0
+    пакет = []
+    for билет in tickets:
+        пакет.append(_статус_билета(билет, момент))
+        if len(пакет) >= размер_пакета:
+            записать(пакет)
+            всего += len(пакет)
+            пакет.clear()
+    if пакет:
+        записать(пакет)
+        всего += len(пакет)
+    return всего